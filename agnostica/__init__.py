@@ -1,32 +1,97 @@
 __copyright__ = 'reapimus 2023-present'
 __version__ = '0.0.2'
 
+import importlib
 import logging
+import sys
+from typing import Any, Dict, List, Tuple
 
 from . import abc as abc
-from .globals import *
-from .http import *
-from .errors import *
-from .gateway import *
-from .mixins import *
-from .enums import *
-from .asset import *
-from .utils import *
-from .colour import *
-from .permissions import *
-from .user import *
-from .embed import *
-from .role import *
-from .file import *
-from .server import *
-from .channel import *
-from .message import *
-from .reaction import *
-from .member import *
-from .webhook import *
-from .badge import *
-from .category import *
-from .presence import *
-from .status import *
-
-logging.getLogger(__name__).addHandler(logging.NullHandler())
\ No newline at end of file
+
+# Public names are resolved lazily (PEP 562) so that importing the package
+# only loads the submodules that are actually used.
+_LAZY_MODULES: Dict[str, Tuple[str, ...]] = {
+    'adapters': ('PlatformAdapter',),
+    'globals': ('platform',),
+    'http': ('MultipartParameters', 'handle_message_parameters', 'json_or_text', 'Route', 'HTTPClientBase'),
+    'errors': (
+        'AgnosticaException',
+        'ClientException',
+        'HTTPException',
+        'BadRequest',
+        'PlatformServerError',
+        'TooManyRequests',
+        'ImATeapot',
+        'NotFound',
+        'Forbidden',
+        'InvalidData',
+        'InvalidArgument',
+    ),
+    'gateway': ('WebSocketClosure', 'WebSocket', 'Heartbeater'),
+    'mixins': ('EqualityComparable', 'Hashable', 'Mentions', 'HasContentMixin'),
+    'enums': ('UserType', 'MessageType', 'ChannelVisibility', 'ChannelType', 'SocialLinkType', 'FileType', 'MediaType'),
+    'asset': ('Asset',),
+    'utils': ('valid_image_extensions', 'valid_video_extensions', 'MISSING', 'get', 'copy_doc', 'Object'),
+    'colour': ('Colour', 'Color'),
+    'permissions': ('Permissions', 'PermissionOverride', 'PermissionOverwrite'),
+    'user': ('BanEntry', 'ClientUser', 'Member', 'MemberBan', 'SocialLink', 'User'),
+    'embed': ('Embed',),
+    'role': ('Role',),
+    'file': ('Attachment', 'File'),
+    'server': ('Guild', 'Server'),
+    'channel': (
+        'Announcement',
+        'AnnouncementChannel',
+        'Availability',
+        'CalendarChannel',
+        'CalendarEvent',
+        'CalendarEventRSVP',
+        'ChatChannel',
+        'DMChannel',
+        'Doc',
+        'DocsChannel',
+        'ForumChannel',
+        'ForumTopic',
+        'Media',
+        'MediaChannel',
+        'ListChannel',
+        'ListItem',
+        'ListItemNote',
+        'PartialMessageable',
+        'RepeatInfo',
+        'SchedulingChannel',
+        'StreamChannel',
+        'StreamingChannel',
+        'TextChannel',
+        'Thread',
+        'VoiceChannel',
+    ),
+    'message': ('ChatMessage', 'Message'),
+    'webhook': ('Webhook', 'WebhookMessage'),
+    'badge': ('Badge',),
+    'category': ('Category', 'CategoryChannel', 'fetch_categories_overrides'),
+    'presence': ('BasePresence', 'Presence'),
+    'status': ('Status',),
+}
+
+_LAZY: Dict[str, str] = {
+    name: module
+    for module, names in _LAZY_MODULES.items()
+    for name in names
+}
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    # Cache on the package so later lookups no longer go through __getattr__
+    setattr(sys.modules[__name__], name, value)
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(_LAZY) | set(vars(sys.modules[__name__])))
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
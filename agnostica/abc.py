@@ -1,26 +1,30 @@
 """This file contains code from guilded.py and discord.py, see LICENSE.txt for full license details."""
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Optional, Sequence
-
-from agnostica.http import HTTPClientBase
+from typing import TYPE_CHECKING, Callable, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 from .utils import MISSING
 from .mixins import HasContentMixin, Hashable
 from .globals import platform
 from .enums import ChannelVisibility, UserType, try_enum
-from .asset import Asset
-from .file import File
-from .presence import BasePresence
 from .enums import ChannelType
-from .message import ChatMessage
 from .override import ChannelRoleOverride, ChannelUserOverride
 
+import asyncio
 import datetime
+import functools
 import abc
+import sys
+import weakref
 
 if TYPE_CHECKING:
     from typing_extensions import Self
 
+    from .adapters import PlatformAdapter
+    from .asset import Asset
+    from .file import File
+    from .http import HTTPClientBase
+    from .message import ChatMessage
+    from .presence import BasePresence
     from .types.user import User as UserPayload
     from .types.channel import ServerChannel as ServerChannelPayload
     from .types.comment import ContentComment
@@ -42,22 +46,45 @@ __all__ = (
     'User',
 )
 
+class _PlatformHooks(NamedTuple):
+    channel_mention: Optional[Callable[[ServerChannel], str]]
+    channel_share_url: Optional[Callable[[ServerChannel], str]]
+    user_profile_url: Optional[Callable[[User], str]]
+    user_vanity_url: Optional[Callable[[User], str]]
+    is_channel_nsfw: Optional[Callable[[ServerChannel], bool]]
+
+def _platform_hooks(adapter: PlatformAdapter) -> _PlatformHooks:
+    # The hooks are kept on the adapter itself so that they are released along
+    # with it. The URL bases are not part of them and are read from the adapter
+    # every time, so changing them later still takes effect.
+    try:
+        return adapter._platform_hooks
+    except AttributeError:
+        hooks = adapter._platform_hooks = _PlatformHooks(
+            channel_mention=getattr(adapter, 'channel_mention', None),
+            channel_share_url=getattr(adapter, 'get_channel_share_url', None),
+            user_profile_url=getattr(adapter, 'get_user_profile_url', None),
+            user_vanity_url=getattr(adapter, 'get_user_vanity_url', None),
+            is_channel_nsfw=getattr(adapter, 'is_channel_nsfw', None),
+        )
+        return hooks
+
 class Messageable(metaclass=abc.ABCMeta):
     """An ABC for models that messages can be sent to."""
+    # Shared default, only instances with a different adapter store their own
+    _platform: PlatformAdapter = platform
+
     def __init__(self, *, state, _platform, data):
         self._state = state
-        self._platform = _platform or platform
-        self.id = data.get('id')
-        self._channel_id = data.get('id')
+        if _platform:
+            self._platform = _platform
+        self.id = self._channel_id = data.get('id')
     
     @property
     def _channel(self) -> Messageable:
-        if isinstance(self, User):
-            return self.dm_channel
-        elif hasattr(self, 'channel'):
-            return self.channel
-        else:
-            return self
+        # Subclasses that send through another object (i.e. users through
+        # their DM channel) override this
+        return self
     
     async def send(
         self,
@@ -204,17 +231,21 @@ class User(Hashable, metaclass=abc.ABCMeta):
         The custom status set by the user.
     """
     default_avatar: Optional[Asset] = None # This gets implemented by the adapter's user class
+    _platform: PlatformAdapter = platform
 
     __slots__ = (
+        '_state',
         'type',
         '_user_type',
         'id',
         'bot_id',
-        'dm_channel',
+        '_dm_channel',
+        '_channel_id',
         'name',
         'nick',
         'bio',
         'tagline',
+        'slug',
         'presence',
         'status',
         'blocked_at',
@@ -223,33 +254,42 @@ class User(Hashable, metaclass=abc.ABCMeta):
         'avatar',
         'banner',
         'badges',
+        '_mention',
+        '_display_name',
+        '_profile_url_cache',
+        '_vanity_url_cache',
+        '_display_avatar_cache',
     )
 
     def __init__(self, *, state: HTTPClientBase, data: UserPayload, **extra):
         self._state = state
-        self._platform = platform
+
+        get = data.get
 
         self.type = None
-        self._user_type = try_enum(UserType, data.get('type', 'user'))
-        self.id: str = data.get('id')
-        self.bot_id: Optional[str] = data.get('botId')
-        self.dm_channel: Optional[ServerChannel] = data.get('dmChannel')
-        self.name: str = data.get('name', '')
+        self._user_type = try_enum(UserType, get('type', 'user'))
+        self.id: str = get('id')
+        self._mention: str = f'<@{self.id}>'
+        self.bot_id: Optional[str] = get('botId')
+        self.dm_channel = get('dmChannel')
+        self.name: str = get('name', '')
         self.nick: Optional[str] = None
-        self.bio: str = data.get('aboutInfo', data.get('bio', ''))
-        self.tagline: Optional[str] = data.get('tagline')
-        self.slug: Optional[str] = data.get('slug')
-        self.presence: BasePresence = data.get('userPresence')
-        self.status = data.get('status')
-
-        self.blocked_at: Optional[datetime.datetime] = data.get('blockedAt')
-        self.online_at: Optional[datetime.datetime] = data.get('onlineAt')
-        self.created_at: datetime.datetime = data.get('createdAt')
+        self.bio: str = get('aboutInfo', get('bio', ''))
+        self.tagline: Optional[str] = get('tagline')
+        self.slug: Optional[str] = get('slug')
+        self.presence: BasePresence = get('userPresence')
+        self.status = get('status')
+
+        self.blocked_at: Optional[datetime.datetime] = get('blockedAt')
+        self.online_at: Optional[datetime.datetime] = get('onlineAt')
+        self.created_at: datetime.datetime = get('createdAt')
 
-        self.avatar: Optional[Asset] = data.get('avatar')
-        self.banner: Optional[Asset] = data.get('banner')
+        self.avatar: Optional[Asset] = get('avatar')
+        self.banner: Optional[Asset] = get('banner')
 
-        self.badges: List = data.get('badges', []) # TODO: Create a Badge class that this will use for better cross-platform support
+        self.badges: List = get('badges', []) # TODO: Create a Badge class that this will use for better cross-platform support
+
+        self._clear_cache()
 
     def __str__(self) -> str:
         return self.display_name or ''
@@ -257,25 +297,46 @@ class User(Hashable, metaclass=abc.ABCMeta):
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} id={self.id!r} name={self.name!r} type={self._user_type!r}>'
     
+    def _clear_cache(self) -> None:
+        # Resets values derived from mutable user data, call this whenever the name, nick, slug or avatar changes
+        self._display_name: str = self.nick if self.nick is not None else self.name
+        self._profile_url_cache: str = MISSING
+        self._vanity_url_cache: Optional[str] = MISSING
+        self._display_avatar_cache: Asset = MISSING
+
+    def _resolve_profile_url(self) -> str:
+        adapter = self._platform
+        user_profile_url = _platform_hooks(adapter).user_profile_url
+        if user_profile_url is not None:
+            return user_profile_url(self)
+        if adapter.PROFILE_BASE:
+            return f'{adapter.PROFILE_BASE}/{self.id}'
+        return adapter.BASE # Fallback URL for compatibility
+
+    def _resolve_vanity_url(self) -> Optional[str]:
+        if self.slug:
+            adapter = self._platform
+            user_vanity_url = _platform_hooks(adapter).user_vanity_url
+            if user_vanity_url is not None:
+                return user_vanity_url(self)
+            if adapter.VANITY_BASE:
+                return f'{adapter.VANITY_BASE}/{self.slug}'
+            elif adapter.PROFILE_BASE:
+                # Try to fallback to the Profile URL if Vanity URL is not available
+                return f'{adapter.PROFILE_BASE}/{self.id}'
+        return None
+
     @property
     def profile_url(self) -> str:
-        if self._platform.get_user_profile_url is not None:
-            return self._platform.get_user_profile_url(self)
-        if self._platform.PROFILE_BASE:
-            return f'{self._platform.PROFILE_BASE}/{self.id}'
-        return self._platform.BASE # Fallback URL for compatibility
+        if self._profile_url_cache is MISSING:
+            self._profile_url_cache = self._resolve_profile_url()
+        return self._profile_url_cache
     
     @property
-    def vanity_url(self) -> str:
-        if self.slug:
-            if self._platform.get_user_vanity_url is not None:
-                return self._platform.get_user_vanity_url(self)
-            if self._platform.VANITY_BASE:
-                return f'{self._platform.VANITY_BASE}/{self.slug}'
-            elif platform.PROFILE_BASE:
-                # Try to fallback to the Profile URL if Vanity URL is not available
-                return f'{self._platform.PROFILE_BASE}/{self.id}'
-        return None
+    def vanity_url(self) -> Optional[str]:
+        if self._vanity_url_cache is MISSING:
+            self._vanity_url_cache = self._resolve_vanity_url()
+        return self._vanity_url_cache
     
     @property
     def mention(self) -> str:
@@ -283,15 +344,25 @@ class User(Hashable, metaclass=abc.ABCMeta):
 
         This will render and deliver a mention when sent in a :class:`.Message`.
         """
-        return f'<@{self.id}>'
+        return self._mention
     
     @property
     def display_name(self) -> str:
-        return self.nick if self.nick is not None else self.name
+        return self._display_name
     
     @property
-    def _channel_id(self) -> Optional[str]:
-        return self.dm_channel.id if self.dm_channel else None
+    def dm_channel(self) -> Optional[ServerChannel]:
+        """Optional[:class:`~.abc.ServerChannel`]: The DM channel with this user, if any."""
+        return self._dm_channel
+
+    @dm_channel.setter
+    def dm_channel(self, channel: Optional[ServerChannel]) -> None:
+        self._dm_channel = channel
+        self._channel_id: Optional[str] = channel.id if channel else None
+
+    @property
+    def _channel(self) -> Optional[ServerChannel]:
+        return self._dm_channel
     
     @property
     def bot(self) -> bool:
@@ -305,47 +376,60 @@ class User(Hashable, metaclass=abc.ABCMeta):
     def display_avatar(self) -> Asset:
         """:class:`.Asset`: The "top-most" avatar for this user, or, the avatar
         that the client will display in the member list and in chat."""
-        return self.avatar or self.default_avatar
+        if self._display_avatar_cache is MISSING:
+            self._display_avatar_cache = self.avatar or self.default_avatar
+        return self._display_avatar_cache
 
 class ServerChannel(Hashable, metaclass=abc.ABCMeta):
     """An ABC for various types of server channels."""
+    _platform: PlatformAdapter = platform
 
     def __init__(self, *, state: HTTPClientBase, data: ServerChannelPayload, group: Optional[Group] = None, **extra):
         self._state = state
         self._group = group
-        self._platform = platform
+        self._server_ref: Optional[weakref.ref[Server]] = None
+
+        get = data.get
 
-        self.group_id: Optional[str] = data.get('groupId')
-        self.server_id: Optional[str] = data.get('serverId')
-        self.category_id: Optional[str] = data.get('categoryId')
+        self.group_id: Optional[str] = get('groupId')
+        self.server_id: Optional[str] = get('serverId')
+        self.category_id: Optional[str] = get('categoryId')
 
-        self.id: str = data.get('id')
-        self.type: ChannelType = try_enum(ChannelType, data.get('type'))
-        self.name: str = data.get('name') or ''
-        self.topic: str = data.get('topic') or ''
-        self.visibility: Optional[ChannelVisibility] = try_enum(ChannelVisibility, data.get('visibility', None))
-        self.nsfw: Optional[bool] = data.get('nsfw', None)
+        self.id: str = get('id')
+        self._mention: str = f'<#{self.id}>'
+        self.type: ChannelType = try_enum(ChannelType, get('type'))
+        # Channel names repeat a lot across servers ("general", "announcements"...)
+        self.name: str = sys.intern(get('name') or '')
+        self.topic: str = get('topic') or ''
+        self.visibility: Optional[ChannelVisibility] = try_enum(ChannelVisibility, get('visibility', None))
+        # Setting nsfw also resets _is_nsfw, which is resolved on the first
+        # is_nsfw() call so subclasses can finish initializing first
+        self.nsfw = get('nsfw', None)
 
         self.created_by_id: Optional[str] = extra.get('createdBy')
-        self.created_at: datetime.datetime = data.get('createdAt')
-        self.updated_at: datetime.datetime = data.get('updatedAt')
+        self.created_at: datetime.datetime = get('createdAt')
+        self.updated_at: datetime.datetime = get('updatedAt')
 
-        self.archived_by_id: Optional[str] = data.get('archivedBy')
-        self.archived_at: Optional[datetime.datetime] = data.get('archivedAt')
+        self.archived_by_id: Optional[str] = get('archivedBy')
+        self.archived_at: Optional[datetime.datetime] = get('archivedAt')
     
     @property
     def share_url(self) -> str:
         """:class:`str`: The share URL of the channel."""
-        return self._platform.share_url(self)
+        channel_share_url = _platform_hooks(self._platform).channel_share_url
+        if channel_share_url is not None:
+            return channel_share_url(self)
+        return self._platform.BASE
     
     jump_url = share_url
 
     @property
     def mention(self) -> str:
-        if self._platform.channel_mention:
+        channel_mention = _platform_hooks(self._platform).channel_mention
+        if channel_mention:
             # Just in case a platform uses a special mention format
-            return self._platform.channel_mention(self)
-        return f'<#{self.id}>'
+            return channel_mention(self)
+        return self._mention
     
     @property
     def group(self) -> Optional[Group]:
@@ -359,7 +443,14 @@ class ServerChannel(Hashable, metaclass=abc.ABCMeta):
     @property
     def server(self) -> Server:
         """:class:`.Server`: The server that this channel is in."""
-        return self._state._get_server(self.server_id)
+        # A weak reference is kept so that servers evicted from the cache
+        # are looked up again instead of being kept alive by their channels
+        server = self._server_ref() if self._server_ref is not None else None
+        if server is None:
+            server = self._state._get_server(self.server_id)
+            if server is not None:
+                self._server_ref = weakref.ref(server)
+        return server
 
     @property
     def guild(self) -> Server:
@@ -397,14 +488,32 @@ class ServerChannel(Hashable, metaclass=abc.ABCMeta):
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} id={self.id!r} name={self.name!r} server={self.server!r}>'
 
+    @property
+    def nsfw(self) -> Optional[bool]:
+        """Optional[:class:`bool`]: Whether the channel is marked as NSFW, if known."""
+        return self._nsfw
+
+    @nsfw.setter
+    def nsfw(self, value: Optional[bool]) -> None:
+        self._nsfw = value
+        self._is_nsfw: bool = MISSING
+
+    def invalidate_nsfw(self) -> None:
+        """Forgets the result of :meth:`is_nsfw`, so that it is worked out again
+        on the next call. Only needed if the platform's NSFW check changes, as
+        setting :attr:`nsfw` already does this."""
+        self._is_nsfw = MISSING
+
     def is_nsfw(self) -> bool:
         """:class:`bool`:"""
-        if self._platform.is_channel_nsfw is not None:
-            return self._platform.is_channel_nsfw(self)
-        elif self.nsfw is not None:
-            return self.nsfw
-        
-        return False
+        if self._is_nsfw is MISSING:
+            is_channel_nsfw = _platform_hooks(self._platform).is_channel_nsfw
+            if is_channel_nsfw is not None:
+                self._is_nsfw = is_channel_nsfw(self)
+            else:
+                self._is_nsfw = self._nsfw if self._nsfw is not None else False
+
+        return self._is_nsfw
     
     async def edit(
         self,
@@ -514,8 +623,9 @@ class ServerChannel(Hashable, metaclass=abc.ABCMeta):
         """
 
         data = await self._platform.get_channel_role_overrides(self.server_id, self.id)
+        server = self.server
         return [
-            ChannelRoleOverride(data=override_data, server=self.server)
+            ChannelRoleOverride(data=override_data, server=server)
             for override_data in data
         ]
 
@@ -619,11 +729,33 @@ class ServerChannel(Hashable, metaclass=abc.ABCMeta):
         """
 
         data = await self._platform.get_channel_user_overrides(self)
+        server = self.server
         return [
-            ChannelUserOverride(data=override_data, server=self.server)
+            ChannelUserOverride(data=override_data, server=server)
             for override_data in data
         ]
 
+    async def fetch_overrides(self) -> Tuple[List[ChannelRoleOverride], List[ChannelUserOverride]]:
+        """|coro|
+
+        Fetch all role-based and user-based permission overrides in this channel.
+
+        Both lists are requested concurrently, which is faster than calling
+        :meth:`.fetch_role_overrides` and :meth:`.fetch_user_overrides` one
+        after the other.
+
+        Returns
+        --------
+        Tuple[List[:class:`.ChannelRoleOverride`], List[:class:`.ChannelUserOverride`]]
+            The role overrides and the user overrides.
+        """
+
+        role_overrides, user_overrides = await asyncio.gather(
+            self.fetch_role_overrides(),
+            self.fetch_user_overrides(),
+        )
+        return role_overrides, user_overrides
+
     async def update_user_override(self, user: Member, override: PermissionOverride) -> ChannelUserOverride:
         """|coro|
 
@@ -688,6 +820,12 @@ class ServerChannel(Hashable, metaclass=abc.ABCMeta):
 
 GuildChannel = ServerChannel # discord.py
 
+@functools.lru_cache(maxsize=4096)
+def _parse_reply_id(raw_id: Union[str, int]) -> int:
+    # The same replies are often seen across several events (creation, edits,
+    # reactions) so repeat IDs share the parsed int instead of re-parsing it
+    return int(raw_id)
+
 class Reply(Hashable, HasContentMixin, metaclass=abc.ABCMeta):
     """
     An ABC for replies to posts.
@@ -728,6 +866,8 @@ class Reply(Hashable, HasContentMixin, metaclass=abc.ABCMeta):
         'replied_to_id',
         'replied_to_author_id',
         '_state',
+        '_platform',
+        '_content_type_cache',
     )
 
     def __init__(self, *, state, _platform, data: ContentComment):
@@ -736,7 +876,7 @@ class Reply(Hashable, HasContentMixin, metaclass=abc.ABCMeta):
         self._platform = _platform or platform
         self.channel_id: str = data.get('channelId')
 
-        self.id: int = int(data['id'])
+        self.id: int = _parse_reply_id(data['id'])
         self.content: str = data['content']
         self._mentions = self._create_mentions(data.get('mentions'))
         self._extract_attachments(self.content)
@@ -748,12 +888,17 @@ class Reply(Hashable, HasContentMixin, metaclass=abc.ABCMeta):
         self.replied_to_id: Optional[int] = None
         self.replied_to_author_id: Optional[str] = None
 
+        self._content_type_cache: str = MISSING
+
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} id={self.id!r} author={self.author!r}>'
 
     @property
     def _content_type(self) -> str:
-        return getattr(self.channel, 'content_type', self.channel.type.value)
+        if self._content_type_cache is MISSING:
+            channel = self.channel
+            self._content_type_cache = getattr(channel, 'content_type', channel.type.value)
+        return self._content_type_cache
 
     @property
     def author(self) -> Optional[Member]:
@@ -780,6 +925,7 @@ class Reply(Hashable, HasContentMixin, metaclass=abc.ABCMeta):
     def _copy(cls, reply):
         self = cls.__new__(cls)
 
+        self._platform = reply._platform
         self.parent = reply.parent
         self.parent_id = reply.parent_id
         self.id = reply.id
@@ -789,6 +935,7 @@ class Reply(Hashable, HasContentMixin, metaclass=abc.ABCMeta):
         self.updated_at = reply.updated_at
         self.replied_to_id = reply.replied_to_id
         self.replied_to_author_id = reply.replied_to_author_id
+        self._content_type_cache = reply._content_type_cache
 
         return self
 
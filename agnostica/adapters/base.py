@@ -1,5 +1,5 @@
 """This file contains code from guilded.py and discord.py, see LICENSE.txt for full license details."""
-from typing import Any, Dict, Optional, overload
+from typing import Any, Callable, Dict, Iterator, List, Optional, Self, Sequence, Tuple, Type, overload
 
 from agnostica.globals import _cv_platform
 from agnostica.http import HTTPClientBase
@@ -7,16 +7,56 @@ from agnostica.embed import Embed
 from agnostica.colour import Colour
 from agnostica.channel import DMChannel
 from agnostica.server import Server
+from agnostica.utils import MISSING
 
 import agnostica.abc
+import contextlib
 import datetime
+import functools
+import re
+
+_UTC = datetime.timezone.utc
+
+# plain embed attributes that are only sent when they are set to something
+_EMBED_FIELDS = ('type', 'description', 'url', 'title')
+
+@functools.lru_cache(maxsize=None)
+def _embed_data_getter(cls: Type[Embed]) -> Callable[[Embed], Dict[str, Any]]:
+    # The raw underscored slots are fixed per class, so a function that reads
+    # exactly those slots is generated once instead of rescanning __slots__ for
+    # every embed. Any of them may be unset, hence the getattr with a default.
+    lines = ['def embed_data(embed):', '    result = {}']
+    for key in cls.__slots__:
+        if key[0] == '_':
+            lines.append(f'    value = getattr(embed, {key!r}, MISSING)')
+            lines.append('    if value is not MISSING:')
+            lines.append(f'        result[{key[1:]!r}] = value')
+    for key in _EMBED_FIELDS:
+        lines.append(f'    value = embed.{key}')
+        lines.append('    if value:')
+        lines.append(f'        result[{key!r}] = value')
+    lines.append('    return result')
+
+    namespace = {'MISSING': MISSING}
+    exec('\n'.join(lines), namespace)
+    return namespace['embed_data']
+
+@functools.lru_cache(maxsize=4096)
+def _join_url(base: Optional[str], path: Any) -> str:
+    # the same users are rendered over and over, so their URLs are built only once
+    return f'{base}/{path}'
 
 def unimplementedFunction():
     raise NotImplementedError("This function is not implemented yet by the adapter. If this is a mistake please report this to the adapter's maintainer.")
 
 class PlatformAdapter:
-    """A base adapter class for interactions with a bot on a platform."""
-    _supported_auth_methods = ["token", "credentials"]
+    """A base adapter class for interactions with a bot on a platform.
+
+    An adapter authenticates either with a token, ``Adapter(token)``, or with a
+    username and password. The username and password must be passed by keyword,
+    ``Adapter(username=..., password=...)``, or through :meth:`from_credentials`,
+    as ``Adapter(username, password)`` would take them as the token and name."""
+    _supported_auth_methods = frozenset({"token", "credentials"})
     _http_client = HTTPClientBase
 
     ATTACHMENT_REGEX = ""
@@ -26,54 +66,121 @@ class PlatformAdapter:
     VANITY_BASE: Optional[str] = None
     DEFAULT_DATE: Optional[datetime.datetime] = None
 
+    # Platforms that can fetch several objects by their IDs in a single request
+    # implement the matching fetch_*_by_ids method and switch its flag on
+    supports_bulk_members = False
+    supports_bulk_roles = False
+    supports_bulk_channels = False
+    BULK_FETCH_LIMIT = 50
+
+    _default_name = 'Platform'
+    _type_name = 'platform'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the adapter's name and type only depend on the class, so work them out once here
+        cls._default_name = cls.__name__.removesuffix("Adapter")
+        cls._type_name = cls._default_name.lower()
+
     def __enter__(self):
-        self._cv_token = _cv_platform.set(self)
+        # tokens are stacked so that the adapter can be entered again while already active
+        self.__dict__.setdefault('_cv_tokens', []).append(_cv_platform.set(self))
+        return self
     
     def __exit__(self, exc_type, exc_value, traceback):
-        _cv_platform.reset(self._cv_token)
-        self._cv_token = None
+        _cv_platform.reset(self._cv_tokens.pop())
+
+    @contextlib.contextmanager
+    def use(self) -> Iterator[Self]:
+        """Makes this adapter the current platform for the duration of a ``with`` block.
+
+        Unlike entering the adapter itself, the context token is kept local to
+        the block, so this is safe to use from concurrently running tasks.
+        """
+        token = _cv_platform.set(self)
+        try:
+            yield self
+        finally:
+            _cv_platform.reset(token)
     
     def __setup__(self, name: str, *args, **kwargs):
         self.http = self._http_client(*args, **kwargs)
-        if name:
-            self.name = name
-        else:
-            self.name = self.__class__.__name__.removesuffix("Adapter")
+        self.name = name or self._default_name
 
     @overload
-    def __init__(self, token: str, name: str=None, *args, **kwargs):
-        if not 'token' in self._supported_auth_methods:
-            raise ValueError(f"Token-based authentication is not supported by {self.__class__.__name__}")
-        self.authentication = {
-            "type": "token",
-            "token": token,
-        }
-        self.__setup__(name=name, *args, **kwargs)
-    
+    def __init__(self, token: str, name: Optional[str] = None, *args, **kwargs) -> None:
+        ...
+
     @overload
-    def __init__(self, username: str, password: str, name: str=None, *args, **kwargs):
-        if not 'credentials' in self._supported_auth_methods:
-            raise ValueError(f"Credential-based authentication is not supported by {self.__class__.__name__}")
-        self.authentication = {
-            "type": "credentials",
-            "username": username,
-            "password": password,
-        }
-        self.__setup__(name=name, *args, **kwargs)
+    def __init__(self, *, username: str, password: str, name: Optional[str] = None, **kwargs) -> None:
+        ...
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        name: Optional[str] = None,
+        *args,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        **kwargs,
+    ):
+        if username is not None or password is not None:
+            if username is None or password is None:
+                raise TypeError('username and password must be passed together')
+            if token is not None:
+                raise TypeError('a token cannot be passed together with a username and password')
+            if not 'credentials' in self._supported_auth_methods:
+                raise ValueError(f"Credential-based authentication is not supported by {self.__class__.__name__}")
+            self.authentication = {
+                "type": "credentials",
+                "username": username,
+                "password": password,
+            }
+        else:
+            if not 'token' in self._supported_auth_methods:
+                raise ValueError(f"Token-based authentication is not supported by {self.__class__.__name__}")
+            self.authentication = {
+                "type": "token",
+                "token": token,
+            }
+        self.__setup__(name, *args, **kwargs)
+
+    @classmethod
+    def from_token(cls, token: str, name: Optional[str] = None, *args, **kwargs) -> Self:
+        """Creates an adapter that authenticates with a token."""
+        return cls(token, name, *args, **kwargs)
+
+    @classmethod
+    def from_credentials(cls, username: str, password: str, name: Optional[str] = None, *args, **kwargs) -> Self:
+        """Creates an adapter that authenticates with a username and password."""
+        return cls(None, name, *args, username=username, password=password, **kwargs)
     
     @property
     def type(self) -> str:
-        return self.__class__.__name__.removesuffix("Adapter").lower()
+        return self._type_name
     
     def get_channel_share_url(self, channel: agnostica.abc.ServerChannel) -> str:
         return self.BASE
     
     def get_user_profile_url(self, user: agnostica.abc.User) -> str:
-        return f'{self.PROFILE_BASE}/{user.id}'
+        return _join_url(self.PROFILE_BASE, user.id)
     
     def get_user_vanity_url(self, user: agnostica.abc.User) -> str:
-        return f'{self.VANITY_BASE}/{user.slug}'
+        return _join_url(self.VANITY_BASE, user.slug)
     
+    def find_attachments(self, content: str) -> List[Tuple[str, str, str]]:
+        """Returns the ``(caption, url, extension)`` of every attachment embedded in the content.
+
+        By default this matches :attr:`ATTACHMENT_REGEX` against the content."""
+        pattern = self.ATTACHMENT_REGEX
+        if not content or pattern == '':
+            return []
+        # Adapters usually precompile their pattern, in which case the
+        # lookup in re's pattern cache can be skipped entirely
+        if isinstance(pattern, re.Pattern):
+            return pattern.findall(content)
+        return re.findall(pattern, content)
+
     def get_dm_channel_share_url(self, channel: DMChannel) -> str:
         return self.BASE
     
@@ -82,6 +189,24 @@ class PlatformAdapter:
     
     async def get_channel(self, server_id: str, channel_id: str):
         unimplementedFunction()
+
+    async def fetch_members_by_ids(self, server_id: str, member_ids: Sequence[str]):
+        """Fetches up to :attr:`BULK_FETCH_LIMIT` members of a server in one request.
+
+        Only called if :attr:`supports_bulk_members` is set."""
+        unimplementedFunction()
+
+    async def fetch_roles_by_ids(self, server_id: str, role_ids: Sequence[str]):
+        """Fetches up to :attr:`BULK_FETCH_LIMIT` roles of a server in one request.
+
+        Only called if :attr:`supports_bulk_roles` is set."""
+        unimplementedFunction()
+
+    async def fetch_channels_by_ids(self, server_id: str, channel_ids: Sequence[str]):
+        """Fetches up to :attr:`BULK_FETCH_LIMIT` channels of a server in one request.
+
+        Only called if :attr:`supports_bulk_channels` is set."""
+        unimplementedFunction()
     
     def get_full_content(self, data: Dict[str, Any]):
         raise NotImplementedError('Received none-string content data from adapter but adapter has not implemented _get_full_content!')
@@ -90,45 +215,22 @@ class PlatformAdapter:
         """Converts an embed to a format the target platform can work with.
         
         By default this will convert to a Discord/Guilded compatible format."""
-        # add in the raw data into the dict
-        result = {
-            key[1:]: getattr(embed, key)
-            for key in embed.__slots__
-            if key[0] == '_' and hasattr(embed, key)
-        }
+        # add in the raw data and the non raw attribute ones into the dict
+        result = _embed_data_getter(embed.__class__)(embed)
 
         # deal with basic convenience wrappers
 
-        try:
-            colour: Colour = result.pop('colour')
-        except KeyError:
-            pass
-        else:
+        colour: Colour = result.pop('colour', MISSING)
+        if colour is not MISSING:
             if colour:
                 result['color'] = colour.value
 
-        try:
-            timestamp = result.pop('timestamp')
-        except KeyError:
-            pass
-        else:
+        timestamp = result.pop('timestamp', MISSING)
+        if timestamp is not MISSING:
             if timestamp:
-                if timestamp.tzinfo:
-                    result['timestamp'] = timestamp.astimezone(tz=datetime.timezone.utc).isoformat()
-                else:
-                    result['timestamp'] = timestamp.replace(tzinfo=datetime.timezone.utc).isoformat()
+                # naive timestamps are assumed to already be in UTC
+                if not timestamp.tzinfo:
+                    timestamp = timestamp.replace(tzinfo=_UTC)
+                result['timestamp'] = timestamp.astimezone(_UTC).isoformat()
 
-        # add in the non raw attribute ones
-        if embed.type:
-            result['type'] = embed.type
-
-        if embed.description:
-            result['description'] = embed.description
-
-        if embed.url:
-            result['url'] = embed.url
-
-        if embed.title:
-            result['title'] = embed.title
-        
         return result
\ No newline at end of file
@@ -2,7 +2,8 @@
 
 import re
 import datetime
-from typing import Any, Dict, Optional
+import functools
+from typing import Any, Dict, List, Optional, Tuple
 
 import agnostica.abc
 
@@ -11,30 +12,238 @@ from agnostica import PlatformAdapter, Embed, Colour, Attachment, Server, HasCon
 from .enums import *
 from .asset import *
 
+# Guilded may sometimes send a number of millisecond digits that
+# datetime.fromisoformat does not accept, so they get stripped before falling back to it
+_MILLISECONDS_RE = re.compile(r'\.\d{1,6}')
+_ISO8601_MS_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+_ISO8601_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
 def ISO8601(string: str):
     if string is None:
         return None
 
+    if string.endswith('Z'):
+        # Pick the single format that can match instead of trying each one
+        format = _ISO8601_MS_FORMAT if '.' in string else _ISO8601_FORMAT
+        try:
+            return datetime.datetime.strptime(string, format)
+        except ValueError:
+            pass
+
     try:
-        return datetime.datetime.strptime(string, '%Y-%m-%dT%H:%M:%S.%fZ')
-    except:
+        return datetime.datetime.fromisoformat(_MILLISECONDS_RE.sub('', string))
+    except ValueError:
+        raise TypeError(f'{string} is not a valid ISO8601 datetime.') from None
+
+# Most mentions have no colour of their own, so the same few strings get parsed
+# repeatedly. Only the parsed value is cached, Colour is mutable so every
+# mention gets an instance of its own.
+@functools.lru_cache(maxsize=256)
+def _colour_value_from_str(value: str) -> int:
+    return Colour.from_str(value).value
+
+# get_full_content handlers, each one renders a single node of a message document
+# by appending its text to parts. Node types without a handler do not contribute any content.
+
+def _mention_element(self: HasContentMixin, element: Dict[str, Any], parts: List[str]) -> None:
+    mentioned = element['data']['mention']
+    mention_type = mentioned['type']
+    if mention_type == 'role':
+        self._raw_role_mentions.append(int(mentioned['id']))
+        parts.append(f'<@{mentioned["id"]}>')
+    elif mention_type == 'person':
+        parts.append(f'<@{mentioned["id"]}>')
+
+        self._raw_user_mentions.append(mentioned['id'])
+        if self.server_id:
+            user = self._state._get_server_member(self.server_id, mentioned['id'])
+        else:
+            user = self._state._get_user(mentioned['id'])
+
+        if user:
+            self._user_mentions.append(user)
+        else:
+            get = mentioned.get
+            user_id = get('id')
+            avatar = get('avatar')
+            is_nickname = get('nickname') is True
+            name = get('name')
+            if is_nickname and get('matcher') is not None:
+                name = name.strip('@').strip(name).strip('@')
+                if not name.strip():
+                    # matcher might be empty, oops - no username is available
+                    name = None
+            user_type = 'bot' if self.created_by_bot else 'user'
+            if self.server_id:
+                self._user_mentions.append(self._state.create_member(
+                    server=self.server,
+                    data={
+                        'id': user_id,
+                        'name': name,
+                        'profilePicture': avatar,
+                        'colour': Colour(_colour_value_from_str(get('color', '#000'))),
+                        'nickname': get('name') if is_nickname else None,
+                        'type': user_type,
+                    }
+                ))
+            else:
+                self._user_mentions.append(self._state.create_user(data={
+                    'id': user_id,
+                    'name': name,
+                    'profilePicture': avatar,
+                    'type': user_type,
+                }))
+
+    elif mention_type in ('everyone', 'here'):
+        # grab the actual display content of the node instead of using a static string
         try:
-            return datetime.datetime.strptime(string, '%Y-%m-%dT%H:%M:%SZ')
-        except:
-            # get rid of milliseconds entirely since Guilded may sometimes
-            # send a number of digits that datetime.fromisoformat does not
-            # accept
-            string = re.sub(r'\.\d{1,6}', '', string)
-            try:
-                return datetime.datetime.fromisoformat(string)
-            except:
-                pass
-        raise TypeError(f'{string} is not a valid ISO8601 datetime.')
+            parts.append(element['nodes'][0]['leaves'][0]['text'])
+        except KeyError:
+            # give up trying to be fancy and use a static string
+            parts.append(f'@{mention_type}')
+
+        if mention_type == 'everyone':
+            self._mentions_everyone = True
+        elif mention_type == 'here':
+            self._mentions_here = True
+
+def _reaction_element(self: HasContentMixin, element: Dict[str, Any], parts: List[str]) -> None:
+    rtext = element['nodes'][0]['leaves'][0]['text']
+    parts.append(str(rtext))
+
+def _link_element(self: HasContentMixin, element: Dict[str, Any], parts: List[str]) -> None:
+    link_text = element['nodes'][0]['leaves'][0]['text']
+    link_href = element['data']['href']
+    if link_href != link_text:
+        parts.append(f'[{link_text}]({link_href})')
+    else:
+        parts.append(link_href)
+
+def _channel_element(self: HasContentMixin, element: Dict[str, Any], parts: List[str]) -> None:
+    channel = element['data']['channel']
+    if channel.get('id'):
+        self._raw_channel_mentions.append(channel["id"])
+        parts.append(f'<#{channel["id"]}>')
+        channel = self._state._get_server_channel(self.server_id, channel['id'])
+        if channel:
+            self._channel_mentions.append(channel)
+
+_MARK_DELIMITERS = {
+    'bold': '**',
+    'italic': '*',
+    'underline': '__',
+    'strikethrough': '~~',
+    'spoiler': '||',
+}
+
+_INLINE_HANDLERS = {
+    'mention': _mention_element,
+    'reaction': _reaction_element,
+    'link': _link_element,
+    'channel': _channel_element,
+}
+
+def _paragraph_node(self: HasContentMixin, node: Dict[str, Any], parts: List[str]) -> None:
+    # paragraphs make up nearly every message, so the lookups used per element are kept local
+    append = parts.append
+    get_inline_handler = _INLINE_HANDLERS.get
+    for element in node['nodes']:
+        element_object = element['object']
+        if element_object == 'text':
+            for leaf in element['leaves']:
+                if not leaf['marks']:
+                    append(leaf['text'])
+                else:
+                    # each mark wraps the text produced by the marks before it,
+                    # so the opening delimiters end up in reverse order
+                    delimiters = [
+                        _MARK_DELIMITERS[mark['type']]
+                        for mark in leaf['marks']
+                        if mark['type'] in _MARK_DELIMITERS
+                    ]
+                    append(''.join(reversed(delimiters)))
+                    append(str(leaf['text']))
+                    append(''.join(delimiters))
+        elif element_object == 'inline':
+            handler = get_inline_handler(element['type'])
+            if handler is not None:
+                handler(self, element, parts)
+
+    append('\n')
+
+def _markdown_plain_text_node(self: HasContentMixin, node: Dict[str, Any], parts: List[str]) -> None:
+    try:
+        parts.append(node['nodes'][0]['leaves'][0]['text'])
+    except KeyError:
+        # probably an "inline" non-text node - their leaves are another node deeper
+        parts.append(node['nodes'][0]['nodes'][0]['leaves'][0]['text'])
+
+        if 'reaction' in node['nodes'][0].get('data', {}):
+            emote_id = node['nodes'][0]['data']['reaction']['id']
+            emote = self._state._get_emote(emote_id)
+            if emote:
+                self.emotes.append(emote)
+
+def _webhook_message_node(self: HasContentMixin, node: Dict[str, Any], parts: List[str]) -> None:
+    if node['data'].get('embeds'):
+        for msg_embed in node['data']['embeds']:
+            self.embeds.append(Embed.from_dict(msg_embed))
+
+def _block_quote_node(self: HasContentMixin, node: Dict[str, Any], parts: List[str]) -> None:
+    quote_content = []
+    for quote_node in node['nodes'][0]['nodes']:
+        if quote_node.get('leaves'):
+            text = str(quote_node['leaves'][0]['text'])
+            quote_content.append(text)
+
+    if quote_content:
+        parts.append('\n> ')
+        parts.append('\n> '.join(quote_content))
+        parts.append('\n')
+
+def _attachment_node(self: HasContentMixin, node: Dict[str, Any], parts: List[str]) -> None:
+    attachment = Attachment(state=self._state, data=node)
+    self.attachments.append(attachment)
+
+_NODE_HANDLERS = {
+    'paragraph': _paragraph_node,
+    'markdown-plain-text': _markdown_plain_text_node,
+    'webhookMessage': _webhook_message_node,
+    'block-quote-container': _block_quote_node,
+    'image': _attachment_node,
+    'video': _attachment_node,
+    'fileUpload': _attachment_node,
+}
+
+@functools.lru_cache(maxsize=4096)
+def _channel_share_url(server_id: Optional[str], group_id: Optional[str], channel_id: str) -> str:
+    if server_id is None:
+        return f'https://www.guilded.gg/chat/{channel_id}'
+
+    # Using "_" for groups will render weirdly in the client, but the channel contents do appear
+    return f'https://www.guilded.gg/teams/{server_id}/groups/{group_id or "_"}/channels/{channel_id}/chat'
+
+@functools.lru_cache(maxsize=1024)
+def _server_vanity_url(slug: Optional[str]) -> str:
+    return f'https://guilded.gg/{slug}'
+
+# Hosts that Guilded serves message attachments from
+_CDN_HOSTS = (
+    's3-us-west-2.amazonaws.com/www.guilded.gg',
+    'img.guildedcdn.com',
+    'img2.guildedcdn.com',
+    'www.guilded.gg',
+    'cdn.gilcdn.com',
+)
 
 class GuildedAdapter(PlatformAdapter):
-    _supported_auth_methods = ['token']
+    _supported_auth_methods = frozenset({'token'})
 
-    ATTACHMENT_REGEX = re.compile(r'!\[(?P<caption>.+)?\]\((?P<url>https:\/\/(?:s3-us-west-2\.amazonaws\.com\/www\.guilded\.gg|img\.guildedcdn\.com|img2\.guildedcdn\.com|www\.guilded\.gg|cdn\.gilcdn\.com)\/(?:ContentMediaGenericFiles|ContentMedia|WebhookPrimaryMedia)\/[a-zA-Z0-9]+-Full\.(?P<extension>webp|jpeg|jpg|png|gif|apng)(?:\?.+)?)\)')
+    ATTACHMENT_REGEX = re.compile(
+        r'!\[(?P<caption>[^\]\n]*)\]\((?P<url>https://(?:' + '|'.join(map(re.escape, _CDN_HOSTS)) + r')'
+        r'/(?:ContentMediaGenericFiles|ContentMedia|WebhookPrimaryMedia)/[a-zA-Z0-9]+-Full\.'
+        r'(?P<extension>webp|jpeg|jpg|png|gif|apng)(?:\?[^)\s]*)?)\)'
+    )
 
     GUILDED_EPOCH_DATETIME = datetime.datetime(2016, 1, 1)
     GUILDED_EPOCH_ISO8601 = GUILDED_EPOCH_DATETIME.isoformat() + 'Z'
@@ -45,164 +254,33 @@ class GuildedAdapter(PlatformAdapter):
     PROFILE_BASE: Optional[str] = 'https://guilded.gg/profile'
     VANITY_BASE: Optional[str] = 'https://guilded.gg/u'
 
-    def get_channel_share_url(self, channel: agnostica.abc.ServerChannel) -> str:
-        if channel.server_id is None:
-            return f'https://www.guilded.gg/chat/{channel.id}'
+    def find_attachments(self, content: str) -> List[Tuple[str, str, str]]:
+        # Every attachment is markdown image syntax pointing at an https URL, so
+        # content without that can skip running the regex altogether
+        if not content or '](https://' not in content:
+            return []
+        return self.ATTACHMENT_REGEX.findall(content)
 
-        # Using "_" for groups will render weirdly in the client, but the channel contents do appear
-        return f'https://www.guilded.gg/teams/{channel.server_id}/groups/{channel.group_id or "_"}/channels/{channel.id}/chat'
+    def get_channel_share_url(self, channel: agnostica.abc.ServerChannel) -> str:
+        return _channel_share_url(channel.server_id, channel.group_id, channel.id)
     
     def get_server_vanity_url(self, server: Server) -> Optional[str]:
-        return f'https://guilded.gg/{server.slug}'
+        return _server_vanity_url(server.slug)
     
     def get_full_content(adapter, self: HasContentMixin, data: Dict[str, Any]):
-        try:
-            nodes = data['document']['nodes']
-        except KeyError:
+        document = data.get('document')
+        nodes = document.get('nodes') if document else None
+        if not nodes:
             # empty message
             return ''
 
-        content = ''
+        parts: List[str] = []
+        get_node_handler = _NODE_HANDLERS.get
         for node in nodes:
-            node_type = node['type']
-            if node_type == 'paragraph':
-                for element in node['nodes']:
-                    if element['object'] == 'text':
-                        for leaf in element['leaves']:
-                            if not leaf['marks']:
-                                content += leaf['text']
-                            else:
-                                to_mark = '{unmarked_content}'
-                                marks = leaf['marks']
-                                for mark in marks:
-                                    if mark['type'] == 'bold':
-                                        to_mark = '**' + to_mark + '**'
-                                    elif mark['type'] == 'italic':
-                                        to_mark = '*' + to_mark + '*'
-                                    elif mark['type'] == 'underline':
-                                        to_mark = '__' + to_mark + '__'
-                                    elif mark['type'] == 'strikethrough':
-                                        to_mark = '~~' + to_mark + '~~'
-                                    elif mark['type'] == 'spoiler':
-                                        to_mark = '||' + to_mark + '||'
-                                    else:
-                                        pass
-                                content += to_mark.format(
-                                    unmarked_content=str(leaf['text'])
-                                )
-                    if element['object'] == 'inline':
-                        if element['type'] == 'mention':
-                            mentioned = element['data']['mention']
-                            if mentioned['type'] == 'role':
-                                self._raw_role_mentions.append(int(mentioned['id']))
-                                content += f'<@{mentioned["id"]}>'
-                            elif mentioned['type'] == 'person':
-                                content += f'<@{mentioned["id"]}>'
-
-                                self._raw_user_mentions.append(mentioned['id'])
-                                if self.server_id:
-                                    user = self._state._get_server_member(self.server_id, mentioned['id'])
-                                else:
-                                    user = self._state._get_user(mentioned['id'])
-
-                                if user:
-                                    self._user_mentions.append(user)
-                                else:
-                                    name = mentioned.get('name')
-                                    if mentioned.get('nickname') is True and mentioned.get('matcher') is not None:
-                                        name = name.strip('@').strip(name).strip('@')
-                                        if not name.strip():
-                                            # matcher might be empty, oops - no username is available
-                                            name = None
-                                    if self.server_id:
-                                        self._user_mentions.append(self._state.create_member(
-                                            server=self.server,
-                                            data={
-                                                'id': mentioned.get('id'),
-                                                'name': name,
-                                                'profilePicture': mentioned.get('avatar'),
-                                                'colour': Colour.from_str(mentioned.get('color', '#000')),
-                                                'nickname': mentioned.get('name') if mentioned.get('nickname') is True else None,
-                                                'type': 'bot' if self.created_by_bot else 'user',
-                                            }
-                                        ))
-                                    else:
-                                        self._user_mentions.append(self._state.create_user(data={
-                                            'id': mentioned.get('id'),
-                                            'name': name,
-                                            'profilePicture': mentioned.get('avatar'),
-                                            'type': 'bot' if self.created_by_bot else 'user',
-                                        }))
-
-                            elif mentioned['type'] in ('everyone', 'here'):
-                                # grab the actual display content of the node instead of using a static string
-                                try:
-                                    content += element['nodes'][0]['leaves'][0]['text']
-                                except KeyError:
-                                    # give up trying to be fancy and use a static string
-                                    content += f'@{mentioned["type"]}'
-
-                                if mentioned['type'] == 'everyone':
-                                    self._mentions_everyone = True
-                                elif mentioned['type'] == 'here':
-                                    self._mentions_here = True
-
-                        elif element['type'] == 'reaction':
-                            rtext = element['nodes'][0]['leaves'][0]['text']
-                            content += str(rtext)
-
-                        elif element['type'] == 'link':
-                            link_text = element['nodes'][0]['leaves'][0]['text']
-                            link_href = element['data']['href']
-                            if link_href != link_text:
-                                content += f'[{link_text}]({link_href})'
-                            else:
-                                content += link_href
-
-                        elif element['type'] == 'channel':
-                            channel = element['data']['channel']
-                            if channel.get('id'):
-                                self._raw_channel_mentions.append(channel["id"])
-                                content += f'<#{channel["id"]}>'
-                                channel = self._state._get_server_channel(self.server_id, channel['id'])
-                                if channel:
-                                    self._channel_mentions.append(channel)
-
-                content += '\n'
-
-            elif node_type == 'markdown-plain-text':
-                try:
-                    content += node['nodes'][0]['leaves'][0]['text']
-                except KeyError:
-                    # probably an "inline" non-text node - their leaves are another node deeper
-                    content += node['nodes'][0]['nodes'][0]['leaves'][0]['text']
-
-                    if 'reaction' in node['nodes'][0].get('data', {}):
-                        emote_id = node['nodes'][0]['data']['reaction']['id']
-                        emote = self._state._get_emote(emote_id)
-                        if emote:
-                            self.emotes.append(emote)
-
-            elif node_type == 'webhookMessage':
-                if node['data'].get('embeds'):
-                    for msg_embed in node['data']['embeds']:
-                        self.embeds.append(Embed.from_dict(msg_embed))
-
-            elif node_type == 'block-quote-container':
-                quote_content = []
-                for quote_node in node['nodes'][0]['nodes']:
-                    if quote_node.get('leaves'):
-                        text = str(quote_node['leaves'][0]['text'])
-                        quote_content.append(text)
-
-                if quote_content:
-                    content += '\n> {}\n'.format('\n> '.join(quote_content))
-
-            elif node_type in {'image', 'video', 'fileUpload'}:
-                attachment = Attachment(state=self._state, data=node)
-                self.attachments.append(attachment)
-
-        content = content.rstrip('\n')
+            handler = get_node_handler(node['type'])
+            if handler is not None:
+                handler(self, node, parts)
+
         # strip ending of newlines in case a paragraph node ended without
         # another paragraph node
-        return content
\ No newline at end of file
+        return ''.join(parts).rstrip('\n')
@@ -4,51 +4,59 @@ import re
 from urllib.parse import quote_plus
 from typing import Optional, Union
 from agnostica import Asset, InvalidArgument
+from agnostica.asset import _cached_asset
 
 __all__ = (
     'GuildedAsset',
 )
 
+_CDN_URL_RE = re.compile(r'\/(?P<key>[a-zA-Z0-9]+)-(?P<size>\w+)\.(?P<format>[a-z]+)')
+
+# The valid integer sizes are the powers of 2 between 16 and 4096
+_VALID_INT_SIZES = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+_SIZE_MAP = {
+    size: 'Large' if size >= 1024 else 'Medium' if size >= 512 else 'Small'
+    for size in _VALID_INT_SIZES
+}
+_BANNER_SIZE_MAP = {
+    size: 'Hero' if size >= 1024 else 'HeroMd'
+    for size in _VALID_INT_SIZES
+}
+
 def convert_int_size(size: int, *, banner: bool = False) -> Optional[str]:
     """Converts an integer passed to Asset.with_size or Asset.replace to a
     Guilded-compliant size for discord.py compatibility."""
-    if not size & (size - 1) and 4096 >= size >= 16:
-        if size >= 1024:
-            return 'Hero' if banner else 'Large'
-        elif 1024 > size >= 512:
-            return 'HeroMd' if banner else 'Medium'
-        elif 0 <= size < 512:
-            return 'HeroMd' if banner else 'Small'
+    return (_BANNER_SIZE_MAP if banner else _SIZE_MAP).get(size)
 
 class GuildedAsset(Asset):
     VALID_BANNER_SIZES = frozenset({'HeroMd', 'Hero'})
-    VALID_ASSET_SIZES = {'Small', 'Medium', 'Large'} | VALID_BANNER_SIZES
+    VALID_ASSET_SIZES = frozenset({'Small', 'Medium', 'Large'}) | VALID_BANNER_SIZES
 
     BASE = 'https://img.guildedcdn.com'
     GIL_BASE = 'https://cdn.gilcdn.com'
     AWS_BASE = 'https://s3-us-west-2.amazonaws.com/www.guilded.gg'
 
-    def strip_cdn_url(self, url: str) -> str:
-        match = re.search(r'\/(?P<key>[a-zA-Z0-9]+)-(?P<size>\w+)\.(?P<format>[a-z]+)', url)
+    @staticmethod
+    def strip_cdn_url(url: str) -> str:
+        match = _CDN_URL_RE.search(url)
         if match:
             return match.group('key')
         raise ValueError(f'Invalid CDN URL: {url}')
     
-    def convert_size(self, size: Union(str, int), *, banner: bool = False) -> Union(str, int):
-        if isinstance(size, int):
+    def convert_size(self, size: Union[str, int], *, banner: bool = False) -> Union[str, int]:
+        if size.__class__ is int:
             size = convert_int_size(size, banner=self._banner)
-            if self._banner:
-                if size not in self.VALID_BANNER_SIZES:
-                    raise InvalidArgument(f'size must be one of {self.VALID_BANNER_SIZES} or be a power of 2 between 16 and 4096')
-            else:
-                if size not in self.VALID_ASSET_SIZES:
-                    raise InvalidArgument(f'size must be one of {self.VALID_ASSET_SIZES} or be a power of 2 between 16 and 4096')
+
+        valid_sizes = self.VALID_BANNER_SIZES if self._banner else self.VALID_ASSET_SIZES
+        if size not in valid_sizes:
+            raise InvalidArgument(f'size must be one of {valid_sizes} or be a power of 2 between 16 and 4096')
         return size
     
     @classmethod
     def _from_default_user_avatar(cls, state, number: int):
         key = f'profile_{number}'
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/asset/DefaultUserAvatars/{key}.png',
             key=key,
@@ -60,7 +68,8 @@ class GuildedAsset(Asset):
         maybe_animated = '.webp' in image_url
         format = 'webp' if animated or maybe_animated else 'png'
         image_hash = cls.strip_cdn_url(image_url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/UserAvatar/{image_hash}-Large.{format}',
             key=image_hash,
@@ -71,7 +80,8 @@ class GuildedAsset(Asset):
     @classmethod
     def _from_user_banner(cls, state, image_url: str):
         image_hash = cls.strip_cdn_url(image_url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/UserBanner/{image_hash}-Hero.png',
             key=image_hash,
@@ -81,7 +91,8 @@ class GuildedAsset(Asset):
     @classmethod
     def _from_team_avatar(cls, state, image_url: str):
         image_hash = cls.strip_cdn_url(image_url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/TeamAvatar/{image_hash}-Large.png',
             key=image_hash,
@@ -90,7 +101,8 @@ class GuildedAsset(Asset):
     @classmethod
     def _from_team_banner(cls, state, image_url: str):
         image_hash = cls.strip_cdn_url(image_url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/TeamBanner/{image_hash}-Hero.png',
             key=image_hash,
@@ -100,7 +112,8 @@ class GuildedAsset(Asset):
     @classmethod
     def _from_group_avatar(cls, state, image_url: str):
         image_hash = cls.strip_cdn_url(image_url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/GroupAvatar/{image_hash}-Large.png',
             key=image_hash,
@@ -109,7 +122,8 @@ class GuildedAsset(Asset):
     @classmethod
     def _from_group_banner(cls, state, image_url: str):
         image_hash = cls.strip_cdn_url(image_url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/GroupBanner/{image_hash}-Large.png',
             key=image_hash,
@@ -119,7 +133,8 @@ class GuildedAsset(Asset):
     def _from_custom_reaction(cls, state, image_url: str, animated: bool = False):
         image_hash = cls.strip_cdn_url(image_url)
         format = 'apng' if animated else 'webp'
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/CustomReaction/{image_hash}-Full.{format}',
             key=image_hash,
@@ -130,7 +145,8 @@ class GuildedAsset(Asset):
     def _from_guilded_stock_reaction(cls, state, name: str, animated: bool = False):
         format = 'apng' if animated else 'webp'
         name = quote_plus(name)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/asset/Emojis/Custom/{name}.{format}',
             key=name,
@@ -141,7 +157,8 @@ class GuildedAsset(Asset):
     def _from_unicode_stock_reaction(cls, state, name: str, animated: bool = False):
         format = 'apng' if animated else 'webp'
         name = quote_plus(name)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/asset/Emojis/{name}.{format}',
             key=name,
@@ -151,7 +168,8 @@ class GuildedAsset(Asset):
     @classmethod
     def _from_default_bot_avatar(cls, state, url: str):
         name = cls.strip_cdn_url(url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/asset/DefaultBotAvatars/{name}.png',
             key=name,
@@ -161,7 +179,8 @@ class GuildedAsset(Asset):
     def _from_webhook_thumbnail(cls, state, image_url: str):
         animated = 'ia=1' in image_url
         image_hash = cls.strip_cdn_url(image_url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/WebhookThumbnail/{image_hash}-Full.webp',
             key=image_hash,
@@ -172,7 +191,8 @@ class GuildedAsset(Asset):
     @classmethod
     def _from_media_thumbnail(cls, state, url: str):
         image_hash = cls.strip_cdn_url(url)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=url,
             key=image_hash,
@@ -183,7 +203,8 @@ class GuildedAsset(Asset):
     @classmethod
     def _from_default_asset(cls, state, name: str):
         name = quote_plus(name)
-        return cls(
+        return _cached_asset(
+            cls,
             state,
             url=f'{cls.BASE}/asset/Default/{name}-lg.png',
             key=name,
@@ -1,8 +1,14 @@
 """This file contains code from guilded.py and discord.py, see LICENSE.txt for full license details."""
+from __future__ import annotations
+
+import asyncio
+import functools
 import io
 import os
-from typing import Any, Optional, Tuple, Union
+import weakref
+from typing import Any, Optional, Tuple, Type, Union
 from urllib.parse import quote_plus
+import aiohttp
 import yarl
 
 from .errors import AgnosticaException, InvalidArgument
@@ -11,15 +17,94 @@ __all__ = (
     'Asset',
 )
 
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+# skips updating the access time, only available on Linux
+_NOATIME = getattr(os, 'O_NOATIME', 0)
+# assets at least this large are written from a thread so they do not hold up the event loop
+_OFFLOAD_WRITE_SIZE = 1 << 20
+
+def _open_for_writing(fp: Union[str, bytes, os.PathLike]) -> int:
+    if _NOATIME:
+        try:
+            return os.open(fp, _WRITE_FLAGS | _NOATIME, 0o666)
+        except PermissionError:
+            # O_NOATIME is refused for files that the process does not own
+            pass
+    return os.open(fp, _WRITE_FLAGS, 0o666)
+
+def _write_all(fd: int, data: bytes) -> int:
+    # os.write may write less than it was given, so keep going until it is all out
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+    return len(data)
+
+def _write_file(fp: Union[str, bytes, os.PathLike, int], data: bytes) -> int:
+    # Like open(fp, 'wb') this writes the file in place, and a file descriptor
+    # that is passed in is closed afterwards
+    fd = fp if isinstance(fp, int) else _open_for_writing(fp)
+    try:
+        return _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+@functools.lru_cache(maxsize=4096)
+def _split_asset_url(url: str) -> Tuple[str, str, Optional[str]]:
+    # The same asset URLs get resized and reformatted over and over, so the URL
+    # without its extension, the extension and the URL up to the size are worked
+    # out once per URL, after which a rewrite is a single concatenation. The last
+    # one is None if the file name does not end in a size.
+    if '?' in url or '#' in url:
+        # only the path is kept when rebuilding a URL, so drop these up front
+        url = str(yarl.URL(url).with_query(None).with_fragment(None))
+
+    path_start = url.find('/', url.find('//') + 2)
+    if path_start == -1:
+        path_start = len(url)
+    origin, full_path = url[:path_start], url[path_start:] or '/'
+
+    path, extension = os.path.splitext(full_path)
+    extension = extension.lstrip('.')
+
+    # sized file names look like {key}-{size}.{extension}
+    size_start = path.rfind('-') + 1
+    sized_stem = origin + path[:size_start] if size_start > path.rfind('/') + 1 else None
+    return origin + path, extension, sized_stem
+
+# The same avatars and emotes show up in payload after payload. Assets are
+# never modified after creation, so one instance is shared per distinct set of
+# arguments instead of creating a new one every time. The state is keyed by its
+# id so that the cache does not keep it alive, and the assets are held weakly.
+# A live entry's asset holds its state, so the id cannot be reused meanwhile.
+_asset_cache: weakref.WeakValueDictionary[Tuple[Any, ...], Asset] = weakref.WeakValueDictionary()
+
+def _cached_asset(cls: Type[Asset], state: Any, **kwargs: Any) -> Asset:
+    key = (cls, id(state), *kwargs.items())
+    try:
+        return _asset_cache[key]
+    except KeyError:
+        asset = _asset_cache[key] = cls(state, **kwargs)
+        return asset
+
 class AssetMixin:
+    __slots__ = ()
+
     url: str
     _state: Optional[Any]
 
-    async def read(self) -> bytes:
+    async def read(self, *, session: Optional[aiohttp.ClientSession] = None) -> bytes:
         """|coro|
 
         Retrieves the content of this asset as a :class:`bytes` object.
 
+        Parameters
+        -----------
+        session: Optional[:class:`aiohttp.ClientSession`]
+            The session to download the asset with. Defaults to the session
+            shared by the internal connection state, which is usually what
+            you want. Passing one is useful when downloading many assets
+            from a separate batch job.
+
         Raises
         -------
         AgnosticaException
@@ -37,9 +122,73 @@ class AssetMixin:
         if self._state is None:
             raise AgnosticaException('Invalid state (none provided)')
 
-        return await self._state.read_filelike_data(self)
+        return await self._state.read_filelike_data(self, session=session)
+
+    async def prefetch(self, *, session: Optional[aiohttp.ClientSession] = None) -> None:
+        """|coro|
+
+        Sends a ``HEAD`` request for this asset without downloading it.
+
+        This opens a connection to the asset's host ahead of time, so that a
+        later :meth:`read` does not have to wait for the connection to be set up.
+
+        Parameters
+        -----------
+        session: Optional[:class:`aiohttp.ClientSession`]
+            The session to send the request with. This should be the same
+            session that the asset is read with later. Defaults to the session
+            shared by the internal connection state.
+
+        Raises
+        -------
+        AgnosticaException
+            There was no internal connection state.
+        HTTPException
+            The request failed.
+        NotFound
+            The asset was deleted.
+        """
+        if self._state is None:
+            raise AgnosticaException('Invalid state (none provided)')
+
+        await self._state.head_filelike_data(self, session=session)
+
+    async def stream(self, fp: io.BufferedIOBase, *, chunk_size: int = 65536) -> int:
+        """|coro|
+
+        Downloads this asset into a file-like object piece by piece, without
+        holding its entire content in memory.
+
+        Parameters
+        -----------
+        fp: :class:`io.BufferedIOBase`
+            The file-like object to write the asset to.
+        chunk_size: :class:`int`
+            The maximum number of bytes to write at a time.
+
+        Raises
+        -------
+        AgnosticaException
+            There was no internal connection state.
+        HTTPException
+            Downloading the asset failed.
+        NotFound
+            The asset was deleted.
+
+        Returns
+        --------
+        :class:`int`
+            The number of bytes written.
+        """
+        if self._state is None:
+            raise AgnosticaException('Invalid state (none provided)')
+
+        written = 0
+        async for chunk in self._state.iter_filelike_data(self, chunk_size=chunk_size):
+            written += fp.write(chunk)
+        return written
 
-    async def save(self, fp: Union[str, bytes, os.PathLike, io.BufferedIOBase], *, seek_begin: bool = True) -> int:
+    async def save(self, fp: Union[str, bytes, os.PathLike, int, io.BufferedIOBase], *, seek_begin: bool = True) -> int:
         """|coro|
 
         Saves this asset into a file-like object.
@@ -49,7 +198,8 @@ class AssetMixin:
         fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
             The file-like object to save this attachment to or the filename
             to use. If a filename is passed then a file is created with that
-            filename and used instead.
+            filename and used instead. A file descriptor may also be passed,
+            in which case it is closed once the asset has been written.
         seek_begin: :class:`bool`
             Whether to seek to the beginning of the file after saving is
             successfully done.
@@ -69,15 +219,19 @@ class AssetMixin:
             The number of bytes written.
         """
 
-        data = await self.read()
         if isinstance(fp, io.BufferedIOBase):
-            written = fp.write(data)
+            written = await self.stream(fp)
             if seek_begin:
                 fp.seek(0)
             return written
         else:
-            with open(fp, 'wb') as f:
-                return f.write(data)
+            # The asset is downloaded before the file is opened, so a failed
+            # download leaves an existing file untouched. It is then written
+            # straight to the file descriptor without another layer of buffering.
+            data = await self.read()
+            if len(data) >= _OFFLOAD_WRITE_SIZE:
+                return await asyncio.to_thread(_write_file, fp, data)
+            return _write_file(fp, data)
 
     async def bytesio(self):
         """|coro|
@@ -99,8 +253,10 @@ class AssetMixin:
         :class:`io.BytesIO`
             The asset as a ``BytesIO`` object.
         """
-        data = await self.read()
-        return io.BytesIO(data)
+        buffer = io.BytesIO()
+        await self.stream(buffer)
+        buffer.seek(0)
+        return buffer
 
 class Asset(AssetMixin):
     """Represents an asset on a platform.
@@ -132,7 +288,11 @@ class Asset(AssetMixin):
         '_state',
         '_url',
         '_animated',
+        '_maybe_animated',
         '_key',
+        '_banner',
+        '_repr',
+        '__weakref__',
     )
 
     BASE = ''
@@ -163,6 +323,7 @@ class Asset(AssetMixin):
         self._maybe_animated = maybe_animated
         self._key = key
         self._banner = banner
+        self._repr: Optional[str] = None
 
     def __str__(self) -> str:
         return self._url
@@ -171,8 +332,13 @@ class Asset(AssetMixin):
         return len(self._url)
 
     def __repr__(self):
-        shorten = self._url.replace(self.BASE, '')
-        return f'<Asset url={shorten!r}>'
+        # assets are never modified after creation, so the repr is built once
+        if self._repr is None:
+            url = self._url
+            if url.startswith(self.BASE):
+                url = url[len(self.BASE):]
+            self._repr = f'<Asset url={url!r}>'
+        return self._repr
 
     def __eq__(self, other):
         return isinstance(other, Asset) and self._url == other._url
@@ -203,7 +369,7 @@ class Asset(AssetMixin):
         able to modify size and format freely."""
         raise NotImplementedError
     
-    def convert_size(self, size: Union(str, int), *, banner: bool = False) -> Union(str, int):
+    def convert_size(self, size: Union[str, int], *, banner: bool = False) -> Union[str, int]:
         """Converts the specified size to something that the platform this asset is for
         supports."""
         raise NotImplementedError
@@ -255,10 +421,8 @@ class Asset(AssetMixin):
         :class:`.Asset`
             The newly updated asset.
         """
-        url = yarl.URL(self._url)
-        path, extension = os.path.splitext(url.path)
-        extension = extension.lstrip('.')
-        current_size = url.path.split('-')[1].replace(f'.{extension}', '')
+        url = self._url
+        stem, extension, sized_stem = _split_asset_url(url)
 
         if format is not None:
             if self._maybe_animated:
@@ -267,20 +431,21 @@ class Asset(AssetMixin):
             else:
                 if format not in self.VALID_STATIC_FORMATS:
                     raise InvalidArgument(f'format must be one of {self.VALID_STATIC_FORMATS}')
-            url = url.with_path(f'{path}.{format}')
+            url = f'{stem}.{format}'
             extension = format
 
         if static_format is not None and not self._maybe_animated:
             if static_format not in self.VALID_STATIC_FORMATS:
                 raise InvalidArgument(f'static_format must be one of {self.VALID_STATIC_FORMATS}')
-            url = url.with_path(f'{path}.{static_format}')
+            url = f'{stem}.{static_format}'
             extension = static_format
 
         if size is not None:
             size = self.convert_size(size, banner=self._banner)
-            url = url.with_path(f'{path.replace(current_size, size)}.{extension}')
+            if sized_stem is None:
+                raise InvalidArgument('this asset does not have a size that can be replaced')
+            url = f'{sized_stem}{size}.{extension}'
 
-        url = str(url)
         return Asset(state=self._state, url=url, key=self._key, animated=self._animated, maybe_animated=self._maybe_animated, banner=self._banner)
 
     def with_size(self, size: str):
@@ -302,11 +467,10 @@ class Asset(AssetMixin):
             The newly updated asset.
         """
         size = self.convert_size(size, banner=self._banner)
-        url = yarl.URL(self._url)
-        path, extension = os.path.splitext(url.path)
-        extension = extension.lstrip('.')
-        current_size = url.path.split('-')[1].replace(f'.{extension}', '')
-        url = str(url.with_path(f'{path.replace(current_size, size)}.{extension}'))
+        _, extension, sized_stem = _split_asset_url(self._url)
+        if sized_stem is None:
+            raise InvalidArgument('this asset does not have a size that can be replaced')
+        url = f'{sized_stem}{size}.{extension}'
         return Asset(state=self._state, url=url, key=self._key, animated=self._animated, maybe_animated=self._maybe_animated)
 
     def with_format(self, format: str):
@@ -341,9 +505,8 @@ class Asset(AssetMixin):
             if format not in self.VALID_STATIC_FORMATS:
                 raise InvalidArgument(f'format must be one of {self.VALID_STATIC_FORMATS}')
 
-        url = yarl.URL(self._url)
-        path, _ = os.path.splitext(url.path)
-        url = str(url.with_path(f'{path}.{format}'))
+        stem, _, _ = _split_asset_url(self._url)
+        url = f'{stem}.{format}'
         return Asset(state=self._state, url=url, key=self._key, animated=self._animated, maybe_animated=self._maybe_animated)
 
     def with_static_format(self, format: str):
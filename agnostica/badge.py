@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Optional, Tuple
 
-from .asset import Asset
+if TYPE_CHECKING:
+    from .asset import Asset
 
 class Badge:
     """Represents a badge on a platform"""
@@ -9,26 +10,37 @@ class Badge:
         "id",
         "name",
         "asset",
-        "amount"
+        "amount",
+        "_hash",
+        "_repr",
     )
 
     def __init__(self, id: str, name: str, asset: Optional[Asset], amount: Optional[int]):
-        self.id = id
-        self.name = name
-        self.asset = asset
-        self.amount = amount or 1
+        # badges are immutable (see __setattr__), so the slots are filled directly
+        _set = object.__setattr__
+        _set(self, "id", id)
+        _set(self, "name", name)
+        _set(self, "asset", asset)
+        _set(self, "amount", amount or 1)
+        # the hash can be computed up front since it can never change
+        _set(self, "_hash", hash((id, self.amount)))
+        _set(self, "_repr", None)
+
+    def __setattr__(self, name: str, value: Any):
+        # badges are used as set members and dict keys, changing one after the
+        # fact would leave it stored under a stale hash
+        raise AttributeError(f"cannot assign to {name!r}, badges are immutable")
     
     def __repr__(self):
-        return f"<Badge id={self.id} name={self.name} amount={self.amount}>"
+        if self._repr is None:
+            object.__setattr__(self, "_repr", f"<Badge id={self.id} name={self.name} amount={self.amount}>")
+        return self._repr
     
     def __str__(self):
         return self.name
     
     def __eq__(self, other: Any):
-        if type(other) != Badge:
-            return False
-        else:
-            return self.id == other.id and self.amount == other.amount
+        return other.__class__ is Badge and self.id == other.id and self.amount == other.amount
     
     def __hash__(self):
-        return hash((self.id, self.amount))
\ No newline at end of file
+        return self._hash
\ No newline at end of file
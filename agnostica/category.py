@@ -1,13 +1,15 @@
 """This file contains code from guilded.py, see LICENSE.txt for full license details."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Optional, Tuple
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
 from .mixins import Hashable
 from .override import CategoryRoleOverride, CategoryUserOverride
 from .globals import platform
 
+import asyncio
 import datetime
+import weakref
 
 if TYPE_CHECKING:
     from .types.category import Category as CategoryPayload
@@ -21,6 +23,7 @@ if TYPE_CHECKING:
 __all__ = (
     'Category',
     'CategoryChannel',
+    'fetch_categories_overrides',
 )
 
 
@@ -69,6 +72,7 @@ class Category(Hashable):
         '_state',
         '_server',
         '_group',
+        '_server_ref',
         '_platform',
         'id',
         'name',
@@ -84,14 +88,17 @@ class Category(Hashable):
         self._platform = _platform or platform
         self._server: Optional[Server] = extra.get('server')
         self._group: Optional[Group] = extra.get('group')
+        self._server_ref: Optional[weakref.ref[Server]] = None
+
+        get = data.get
 
         self.id: int = data['id']
-        self.name: str = data.get('name') or ''
-        self.server_id: str = data.get('serverId')
-        self.group_id: str = data.get('groupId')
-        self.created_at: datetime.datetime = data.get('createdAt')
-        self.updated_at: Optional[datetime.datetime] = data.get('updatedAt')
-        self.priority: Optional[int] = data.get('priority')
+        self.name: str = get('name') or ''
+        self.server_id: str = get('serverId')
+        self.group_id: str = get('groupId')
+        self.created_at: datetime.datetime = get('createdAt')
+        self.updated_at: Optional[datetime.datetime] = get('updatedAt')
+        self.priority: Optional[int] = get('priority')
 
     def __str__(self):
         return self.name
@@ -103,15 +110,30 @@ class Category(Hashable):
     def group(self) -> Optional[Group]:
         """Optional[:class:`~agnostica.Group`]: The group that this category is in."""
         group = self._group
-        if not group and self.server:
-            group = self.server.get_group(self.group_id)
+        if not group:
+            server = self.server
+            if server:
+                group = server.get_group(self.group_id)
 
         return group
 
     @property
     def server(self) -> Server:
         """:class:`.Server`: The server that this category is in."""
-        return self._group.server if self._group else self._server or self._state._get_server(self.server_id)
+        if self._group:
+            return self._group.server
+
+        if self._server:
+            return self._server
+
+        # A weak reference is kept so that servers evicted from the cache
+        # are looked up again instead of being kept alive by their categories
+        server = self._server_ref() if self._server_ref is not None else None
+        if server is None:
+            server = self._state._get_server(self.server_id)
+            if server is not None:
+                self._server_ref = weakref.ref(server)
+        return server
 
     @property
     def guild(self) -> Server:
@@ -185,7 +207,7 @@ class Category(Hashable):
             role.id,
             permissions=override.to_dict(),
         )
-        return CategoryRoleOverride(data=data, server=self.server)
+        return CategoryRoleOverride(data=data, server=self.server, category=self)
 
     async def fetch_role_override(self, role: Role) -> CategoryRoleOverride:
         """|coro|
@@ -208,7 +230,7 @@ class Category(Hashable):
             self.id,
             role.id,
         )
-        return CategoryRoleOverride(data=data, server=self.server)
+        return CategoryRoleOverride(data=data, server=self.server, category=self)
 
     async def fetch_role_overrides(self) -> List[CategoryRoleOverride]:
         """|coro|
@@ -222,8 +244,9 @@ class Category(Hashable):
         """
 
         data = await self._platform.get_category_role_overrides(self.server_id, self.id)
+        server = self.server
         return [
-            CategoryRoleOverride(data=override_data, server=self.server)
+            CategoryRoleOverride(data=override_data, server=server, category=self)
             for override_data in data
         ]
 
@@ -251,7 +274,7 @@ class Category(Hashable):
             role.id,
             permissions=override.to_dict(),
         )
-        return CategoryRoleOverride(data=data, server=self.server)
+        return CategoryRoleOverride(data=data, server=self.server, category=self)
 
     async def delete_role_override(self, role: Role) -> None:
         """|coro|
@@ -294,7 +317,7 @@ class Category(Hashable):
             user.id,
             permissions=override.to_dict(),
         )
-        return CategoryUserOverride(data=data, server=self.server)
+        return CategoryUserOverride(data=data, server=self.server, category=self)
 
     async def fetch_user_override(self, user: Member) -> CategoryUserOverride:
         """|coro|
@@ -317,7 +340,7 @@ class Category(Hashable):
             self.id,
             user.id,
         )
-        return CategoryUserOverride(data=data, server=self.server)
+        return CategoryUserOverride(data=data, server=self.server, category=self)
 
     async def fetch_user_overrides(self) -> List[CategoryUserOverride]:
         """|coro|
@@ -331,11 +354,33 @@ class Category(Hashable):
         """
 
         data = await self._platform.get_category_user_overrides(self.server_id, self.id)
+        server = self.server
         return [
-            CategoryUserOverride(data=override_data, server=self.server)
+            CategoryUserOverride(data=override_data, server=server, category=self)
             for override_data in data
         ]
 
+    async def fetch_overrides(self) -> Tuple[List[CategoryRoleOverride], List[CategoryUserOverride]]:
+        """|coro|
+
+        Fetch all role-based and user-based permission overrides in this category.
+
+        Both lists are requested concurrently, which is faster than calling
+        :meth:`.fetch_role_overrides` and :meth:`.fetch_user_overrides` one
+        after the other.
+
+        Returns
+        --------
+        Tuple[List[:class:`.CategoryRoleOverride`], List[:class:`.CategoryUserOverride`]]
+            The role overrides and the user overrides.
+        """
+
+        role_overrides, user_overrides = await asyncio.gather(
+            self.fetch_role_overrides(),
+            self.fetch_user_overrides(),
+        )
+        return role_overrides, user_overrides
+
     async def update_user_override(self, user: Member, override: PermissionOverride) -> CategoryUserOverride:
         """|coro|
 
@@ -360,7 +405,7 @@ class Category(Hashable):
             user.id,
             permissions=override.to_dict(),
         )
-        return CategoryUserOverride(data=data, server=self.server)
+        return CategoryUserOverride(data=data, server=self.server, category=self)
 
     async def delete_user_override(self, user: Member) -> None:
         """|coro|
@@ -395,4 +440,38 @@ class Category(Hashable):
         data = await self._platform.delete_category(self.server_id, self.id)
         return Category(state=self._state, _platform=self._platform, data=data, group=self._group, server=self._server)
 
-CategoryChannel = Category  # discord.py
\ No newline at end of file
+CategoryChannel = Category  # discord.py
+
+async def fetch_categories_overrides(
+    categories: Iterable[Category],
+    *,
+    limit: int = 16,
+) -> List[Tuple[List[CategoryRoleOverride], List[CategoryUserOverride]]]:
+    """|coro|
+
+    Fetch the permission overrides of many categories at once.
+
+    At most ``limit`` categories are fetched concurrently so that dumping a
+    large server does not send every request at the same time.
+
+    Parameters
+    -----------
+    categories: Iterable[:class:`.Category`]
+        The categories to fetch the overrides of.
+    limit: :class:`int`
+        The maximum number of categories to fetch at the same time.
+
+    Returns
+    --------
+    List[Tuple[List[:class:`.CategoryRoleOverride`], List[:class:`.CategoryUserOverride`]]]
+        The role overrides and the user overrides of each category, in the
+        same order as ``categories``.
+    """
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def fetch(category: Category) -> Tuple[List[CategoryRoleOverride], List[CategoryUserOverride]]:
+        async with semaphore:
+            return await category.fetch_overrides()
+
+    return list(await asyncio.gather(*(fetch(category) for category in categories)))
@@ -1701,6 +1701,7 @@ class ForumTopic(Hashable, HasContentMixin):
         '_state',
         'channel',
         'channel_id',
+        'server_id',
         'group_id',
         'id',
         'title',
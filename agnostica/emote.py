@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import datetime
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from .asset import AssetMixin, Asset
 from .errors import InvalidArgument
@@ -18,6 +18,9 @@ __all__ = (
     'Emote',
 )
 
+_VALID_EMOTE_FORMATS = frozenset({'png', 'webp'})
+_INVALID_EMOTE_FORMAT = "format must be one of ['png', 'webp']"
+
 
 class Emote(Hashable, AssetMixin):
     """Represents an emote on a platform.
@@ -48,22 +51,52 @@ class Emote(Hashable, AssetMixin):
         The emote's name.
     server_id: Optional[:class:`str`]
         The ID of the server that the emote is from, if any.
+    animated: :class:`bool`
+        Whether the emote is animated.
+    url: Optional[:class:`str`]
+        The emote's CDN URL.
     """
 
+    __slots__: Tuple[str, ...] = (
+        '_state',
+        '_server',
+        'id',
+        'name',
+        'server_id',
+        'author_id',
+        'created_at',
+        '_animated',
+        'aliases',
+        '_underlying',
+        'url',
+        'animated',
+    )
+
     def __init__(self, *, state, data: EmotePayload, **extra):
         self._state = state
         self._server = extra.get('server')
 
-        self.id: int = data.get('id')
-        self.name: str = data.get('name') or ''
-        self.server_id: Optional[str] = data.get('serverId') or data.get('teamId')
-        self.author_id: Optional[str] = data.get('createdBy')
-        self.created_at: Optional[datetime.datetime] = data.get('createdAt')
+        get = data.get
+
+        self.id: int = get('id')
+        self.name: str = get('name') or ''
+        self.server_id: Optional[str] = get('serverId') or get('teamId')
+        self.author_id: Optional[str] = get('createdBy')
+        self.created_at: Optional[datetime.datetime] = get('createdAt')
 
-        self._animated: bool = data.get('isAnimated', False)
-        self.aliases: List[str] = data.get('aliases', [])
+        self._animated: bool = get('isAnimated', False)
+        self.aliases: List[str] = get('aliases', [])
 
-        self._underlying: Asset = data.get('asset')
+        self._underlying: Asset = get('asset')
+
+        # these only depend on the underlying asset, so they are resolved up front
+        # instead of going through it on every access
+        if self._underlying is not None:
+            self.url: Optional[str] = self._underlying.url
+            self.animated: bool = self._underlying.is_animated()
+        else:
+            self.url: Optional[str] = None
+            self.animated: bool = self._animated
 
     def __str__(self):
         return self.name
@@ -91,16 +124,6 @@ class Emote(Hashable, AssetMixin):
         """
         return self.server
 
-    @property
-    def animated(self) -> bool:
-        """:class:`bool`: Whether the emote is animated."""
-        return self._underlying.is_animated()
-
-    @property
-    def url(self) -> str:
-        """:class:`str`: The emote's CDN URL."""
-        return self._underlying.url
-
     def url_with_format(self, format: str) -> str:
         """Returns a new URL with a different format. By default, the format
         will be ``apng`` if provided, else ``webp``.
@@ -126,11 +149,8 @@ class Emote(Hashable, AssetMixin):
             Invalid format provided.
         """
 
-        valid_formats = ['png', 'webp']
-
-
-        if format not in valid_formats:
-            raise InvalidArgument(f'format must be one of {valid_formats}')
+        if format not in _VALID_EMOTE_FORMATS:
+            raise InvalidArgument(_INVALID_EMOTE_FORMAT)
 
         return self._underlying.with_format(format).url
 
@@ -158,10 +178,12 @@ class Emote(Hashable, AssetMixin):
             Invalid format provided.
         """
 
-        valid_formats = ['png', 'webp']
+        if self.animated:
+            # the underlying asset would be returned unchanged anyway
+            return self.url
 
-        if format not in valid_formats:
-            raise InvalidArgument(f'format must be one of {valid_formats}')
+        if format not in _VALID_EMOTE_FORMATS:
+            raise InvalidArgument(_INVALID_EMOTE_FORMAT)
 
         return self._underlying.with_static_format(format).url
 
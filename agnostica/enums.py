@@ -1,7 +1,7 @@
 """This file contains code from guilded.py and discord.py, see LICENSE.txt for full license details."""
-from collections import namedtuple
-from typing import Any, ClassVar, Dict, List, TYPE_CHECKING, Type, TypeVar
+from typing import Any, ClassVar, Dict, List, TYPE_CHECKING, Tuple, Type, TypeVar
 
+import sys
 import types
 
 __all__ = (
@@ -14,16 +14,58 @@ __all__ = (
     'MediaType',
 )
 
+# A plain slotted class rather than a namedtuple, so that reading .name and
+# .value is a slot access instead of a tuple index behind a property. Every
+# enum gets an empty subclass of it that only records the enum's name.
+class _EnumValue:
+    __slots__ = ('name', 'value', '_str')
+    _enum_name_: str
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+        self._str = self._format_str_()
+
+    def __repr__(self):
+        return f'<{self._enum_name_}.{self.name}: {self.value!r}>'
+
+    # An enum's own __str__ is stored as _format_str_ and its result is kept
+    # on the member, so that formatting a member does no work of its own
+    def _format_str_(self):
+        return f'{self._enum_name_}.{self.name}'
+
+    def __str__(self):
+        return self._str
+
+    # Values of the same enum with the same name and value are equal, as they
+    # were when they were namedtuples, so that unknown values made separately
+    # for the same payload value still compare equal
+    def __eq__(self, other):
+        return self is other or (
+            other.__class__ is self.__class__ and self.name == other.name and self.value == other.value
+        )
+
+    def __hash__(self):
+        return hash(self.value)
+
+class _ComparableEnumValue(_EnumValue):
+    __slots__ = ()
+
+    def __le__(self, other):
+        return isinstance(other, self.__class__) and self.value <= other.value
+
+    def __ge__(self, other):
+        return isinstance(other, self.__class__) and self.value >= other.value
+
+    def __lt__(self, other):
+        return isinstance(other, self.__class__) and self.value < other.value
+
+    def __gt__(self, other):
+        return isinstance(other, self.__class__) and self.value > other.value
+
 def _create_value_cls(name, comparable):
-    cls = namedtuple('_EnumValue_' + name, 'name value')
-    cls.__repr__ = lambda self: f'<{name}.{self.name}: {self.value!r}>'
-    cls.__str__ = lambda self: f'{name}.{self.name}'
-    if comparable:
-        cls.__le__ = lambda self, other: isinstance(other, self.__class__) and self.value <= other.value
-        cls.__ge__ = lambda self, other: isinstance(other, self.__class__) and self.value >= other.value
-        cls.__lt__ = lambda self, other: isinstance(other, self.__class__) and self.value < other.value
-        cls.__gt__ = lambda self, other: isinstance(other, self.__class__) and self.value > other.value
-    return cls
+    base = _ComparableEnumValue if comparable else _EnumValue
+    return type('_EnumValue_' + name, (base,), {'__slots__': (), '_enum_name_': name})
 
 def _is_descriptor(obj):
     return hasattr(obj, '__get__') or hasattr(obj, '__set__') or hasattr(obj, '__delete__')
@@ -34,6 +76,7 @@ class EnumMeta(type):
         _enum_member_names_: ClassVar[List[str]]
         _enum_member_map_: ClassVar[Dict[str, Any]]
         _enum_value_map_: ClassVar[Dict[Any, Any]]
+        _enum_member_tuple_: ClassVar[Tuple[Any, ...]]
 
     def __new__(cls, name, bases, attrs, *, comparable: bool = False):
         value_mapping = {}
@@ -51,10 +94,14 @@ class EnumMeta(type):
                 continue
 
             if is_descriptor:
-                setattr(value_cls, key, value)
+                setattr(value_cls, '_format_str_' if key == '__str__' else key, value)
                 del attrs[key]
                 continue
 
+            if value.__class__ is str:
+                # lets lookups with a matching interned string stop at the identity check
+                value = sys.intern(value)
+
             try:
                 new_value = value_mapping[value]
             except KeyError:
@@ -65,35 +112,43 @@ class EnumMeta(type):
             member_mapping[key] = new_value
             attrs[key] = new_value
 
+        # __str__ is defined after the members in the class body, so the strings
+        # are worked out again now that it is known
+        for member in value_mapping.values():
+            member._str = member._format_str_()
+
         attrs['_enum_value_map_'] = value_mapping
         attrs['_enum_member_map_'] = member_mapping
         attrs['_enum_member_names_'] = member_names
+        # iteration and __members__ are served from these instead of being rebuilt
+        attrs['_enum_member_tuple_'] = tuple(member_mapping[name] for name in member_names)
+        attrs['_enum_members_proxy_'] = types.MappingProxyType(member_mapping)
         attrs['_enum_value_cls_'] = value_cls
         actual_cls = super().__new__(cls, name, bases, attrs)
         value_cls._actual_enum_cls_ = actual_cls  # type: ignore
         return actual_cls
 
     def __iter__(cls):
-        return (cls._enum_member_map_[name] for name in cls._enum_member_names_)
+        return iter(cls._enum_member_tuple_)
 
     def __reversed__(cls):
-        return (cls._enum_member_map_[name] for name in reversed(cls._enum_member_names_))
+        return reversed(cls._enum_member_tuple_)
 
     def __len__(cls):
-        return len(cls._enum_member_names_)
+        return len(cls._enum_member_tuple_)
 
     def __repr__(cls):
         return f'<enum {cls.__name__}>'
 
     @property
     def __members__(cls):
-        return types.MappingProxyType(cls._enum_member_map_)
+        return cls._enum_members_proxy_
 
     def __call__(cls, value):
         try:
             return cls._enum_value_map_[value]
         except (KeyError, TypeError):
-            raise ValueError(f"{value!r} is not a valid {cls.__name__}")
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}") from None
 
     def __getitem__(cls, key):
         return cls._enum_member_map_[key]
@@ -123,6 +178,10 @@ else:
             except (KeyError, TypeError):
                 return value
 
+        @classmethod
+        def from_value(cls, value):
+            return cls._enum_value_map_[value]
+
 class UserType(Enum):
     user = 'user'
     bot = 'bot'
@@ -223,6 +282,11 @@ def try_enum(cls: Type[T], val: Any) -> T:
     If it fails it returns a proxy invalid value instead.
     """
     try:
-        return cls._enum_value_map_[val]  # type: ignore
-    except (KeyError, TypeError, AttributeError):
-        return create_unknown_value(cls, val)
\ No newline at end of file
+        member = cls._enum_value_map_.get(val)  # type: ignore
+    except (TypeError, AttributeError):
+        # unhashable values can never be members
+        member = None
+
+    if member is None:
+        return create_unknown_value(cls, val)
+    return member
\ No newline at end of file
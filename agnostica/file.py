@@ -5,6 +5,7 @@ import re
 from typing import Any, Dict, Optional, Union
 
 from .asset import AssetMixin
+from .enums import FileType
 from .globals import platform
 from . import utils
 
@@ -14,6 +15,10 @@ __all__ = (
     'File',
 )
 
+def _noop() -> None:
+    # stands in for a file's close method until File.close is called
+    pass
+
 
 class File:
     """Wraps files pre- and mid-upload.
@@ -67,6 +72,7 @@ class File:
     ):
         self.url: Optional[str] = None
         self.filename: Optional[str] = filename
+        self.file_type: Optional[FileType] = None
 
         if isinstance(fp, io.IOBase):
             if not (fp.seekable() and fp.readable()):
@@ -76,7 +82,10 @@ class File:
             self._owner = False
             self._original_pos = fp.tell()
 
-            self.fp.name = getattr(self.fp, 'name', self.filename)
+            try:
+                self.fp.name
+            except AttributeError:
+                self.fp.name = self.filename
 
         else:
             self.fp = open(fp, 'rb')
@@ -84,10 +93,10 @@ class File:
             self._original_pos = 0
 
         self._closer = self.fp.close
-        self.fp.close = lambda: None
+        self.fp.close = _noop
 
     def __repr__(self) -> str:
-        return f'<File type={self.type}>'
+        return f'<File type={self.file_type}>'
 
     def __bytes__(self) -> bytes:
         return self.fp.read()
@@ -136,19 +145,23 @@ class Attachment(AssetMixin):
         'height',
         'size',
         'filename',
+        'content_type',
+        'description',
     )
 
     def __init__(self, *, state, data: Dict[str, Any], **extra):
         self._state = state
 
-        self.size: Optional[int] = data.get('size')
-        self.filename: Optional[str] = data.get('name')
+        get = data.get
+
+        self.size: Optional[int] = get('size')
+        self.filename: Optional[str] = get('name')
 
-        self.url: str = data.get('url')
-        self.width: Optional[int] = data.get('width')
-        self.height: Optional[int] = data.get('height')
-        self.content_type: Optional[str] = data.get('content_type')
-        self.description: Optional[str] = data.get('description')
+        self.url: str = get('url')
+        self.width: Optional[int] = get('width')
+        self.height: Optional[int] = get('height')
+        self.content_type: Optional[str] = get('content_type')
+        self.description: Optional[str] = get('description')
 
     def __repr__(self) -> str:
         return f'<Attachment filename={self.filename!r} url={self.url!r}>'
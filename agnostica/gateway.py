@@ -6,12 +6,8 @@ import re
 import time
 import aiohttp
 import asyncio
-import concurrent.futures
 import json
 import logging
-import sys
-import threading
-import traceback
 
 from typing import TYPE_CHECKING, Dict, Optional, Any
 
@@ -64,48 +60,55 @@ class WebSocket:
 
         return ws
 
-class Heartbeater(threading.Thread):
+class Heartbeater:
+    """Keeps a :class:`WebSocket` alive by pinging it every ``interval`` seconds.
+
+    This runs as a task on the websocket's event loop, so beats involve no
+    hand-off between threads.
+    """
     def __init__(self, ws: WebSocket, interval: float):
         self.ws = ws
         self.interval = interval
-        super().__init__()
 
         self.msg = "Keeping websocket alive with sequence %s."
         self.block_msg = "Websocket heartbeat blocked for longer than %s seconds."
         self.behind_msg = "Can't keep up, websocket is %.1fs behind."
-        self._stop_ev = threading.Event()
+        self._stop_ev = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
 
         self._last_ping: float = time.perf_counter()
         self._last_pong: float = time.perf_counter()
         self.latency: float = float('inf')
-    
-    def run(self):
-        log.debug("Starting heartbeat thread.")
-        while not self._stop_ev.wait(self.interval):
+
+    def start(self) -> None:
+        self._task = self.ws.loop.create_task(self.run())
+
+    async def _wait_stopped(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._stop_ev.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def run(self):
+        log.debug("Starting heartbeat task.")
+        while not await self._wait_stopped(self.interval):
             log.debug("Sending heartbeat.")
-            coro = self.ws.ping()
-            f = asyncio.run_coroutine_threadsafe(coro, self.ws.loop)
+            # the pong can arrive before the ping coroutine finishes, so the time is taken up front
+            self._last_ping = time.perf_counter()
+            ping = asyncio.ensure_future(self.ws.ping())
             try:
                 total = 0
                 while True:
-                    try:
-                        f.result(10)
+                    done, _ = await asyncio.wait((ping,), timeout=10)
+                    if done:
+                        ping.result()
                         break
-                    except concurrent.futures.TimeoutError:
-                        total += 10
-                        try:
-                            frame = sys._current_frames()[self._main_thread_id]
-                        except KeyError:
-                            msg = self.block_msg
-                        else:
-                            stack = traceback.format_stack(frame)
-                            msg = '%s\nLoop thread traceback (most recent call last):\n%s' % (self.block_msg, ''.join(stack))
-                        log.warning(msg, total)
+                    total += 10
+                    log.warning(self.block_msg, total)
             except Exception:
                 self.stop()
-            else:
-                self._last_ping = time.perf_counter()
-        
+
     def stop(self) -> None:
         self._stop_ev.set()
     
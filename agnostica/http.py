@@ -1,21 +1,22 @@
 """This file contains code from guilded.py and discord.py, see LICENSE.txt for full license details."""
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Union, NamedTuple, List, Sequence, TypeVar, Type
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union, NamedTuple, List, Sequence, TypeVar, Type
 
 import aiohttp
 import asyncio
 import logging
-import json
 
 from .file import File, Attachment
 from .asset import Asset
 from .gateway import WebSocket
-from .utils import MISSING
+from .utils import MISSING, _from_json, _to_json
 from .embed import Embed
 
 from . import __version__
-from .errors import Forbidden, PlatformServerError, HTTPException, NotFound
+from .errors import BadRequest, Forbidden, ImATeapot, PlatformServerError, HTTPException, NotFound
 import sys
+from collections import ChainMap
+from urllib.parse import urlencode
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -84,18 +85,11 @@ def handle_message_parameters(
         if len(embeds) > 10:
             raise ValueError('embeds has a maximum of 10 elements.')
         payload['embeds'] = [e.to_dict() for e in embeds]
-
-    if embed is not MISSING:
-        if embed is None:
-            payload['embeds'] = []
-        else:
-            payload['embeds'] = [embed.to_dict()]
+    elif embed is not MISSING:
+        payload['embeds'] = [] if embed is None else [embed.to_dict()]
 
     if content is not MISSING:
-        if content is not None:
-            payload['content'] = str(content)
-        else:
-            payload['content'] = None
+        payload['content'] = str(content) if content is not None else None
 
     if reply_to is not MISSING:
         payload['replyMessageIds'] = reply_to
@@ -115,28 +109,42 @@ def handle_message_parameters(
     if avatar_url:
         payload['avatar_url'] = str(avatar_url)
 
-    multipart = []
-    if files:
-        multipart.append({'name': 'payload_json', 'value': json.dumps(payload)})
-        payload = None
-        for index, file in enumerate(files):
-            multipart.append({
-                'name': f'files[{index}]',
-                'value': file.fp,
-                'filename': file.filename,
-            })
-
-    return MultipartParameters(payload=payload, multipart=multipart, files=files)
+    if not files:
+        return MultipartParameters(payload=payload, multipart=[], files=files)
+
+    multipart = [{'name': 'payload_json', 'value': _to_json(payload)}]
+    for index, file in enumerate(files):
+        multipart.append({
+            'name': f'files[{index}]',
+            'value': file.fp,
+            'filename': file.filename,
+        })
+
+    return MultipartParameters(payload=None, multipart=multipart, files=files)
+
+# How long to wait before each retry, which also bounds the number of attempts
+_RETRY_DELAYS = (1, 3, 5, 7, 9)
+# Server errors that are retried without looking any further at the response
+_RETRY_STATUSES = frozenset({500, 502, 504, 524})
+_STATUS_EXCEPTIONS: Dict[int, Type[HTTPException]] = {
+    400: BadRequest,
+    403: Forbidden,
+    404: NotFound,
+    418: ImATeapot,
+}
+
+def _exception_for_status(status: int) -> Type[HTTPException]:
+    exc = _STATUS_EXCEPTIONS.get(status)
+    if exc is None:
+        exc = PlatformServerError if status >= 500 else HTTPException
+    return exc
 
 async def json_or_text(response: aiohttp.ClientResponse) -> Union[Dict[str, Any], str]:
-    text = await response.text(encoding='utf-8')
-    try:
-        if response.headers['content-type'] == 'application/json':
-            return json.loads(text)
-    except KeyError:
-        pass
-    
-    return text
+    # JSON is parsed straight from the body's bytes rather than decoding it to text first
+    if response.headers.get('content-type', '').startswith('application/json'):
+        return _from_json(await response.read())
+
+    return await response.text(encoding='utf-8')
 
 class Route:
     BASE = ''
@@ -154,9 +162,12 @@ class HTTPClientBase:
     BASE = ''
     NO_BASE = ''
 
-    def __init__(self, *, max_messages: Optional[int]=1000):
+    def __init__(self, *, max_messages: Optional[int]=1000, pool_size: int=100):
         self.session: Optional[aiohttp.ClientSession] = None
         self.max_messages = max_messages
+        # The maximum number of simultaneous connections, concurrent requests
+        # beyond this are queued by the connector until a connection frees up
+        self.pool_size = pool_size
 
         self.ws: Optional[WebSocket] = None
         # self.user: Optional[ClientUser] = None
@@ -167,66 +178,101 @@ class HTTPClientBase:
         self._emojis = {}
         self._dm_channels = {}
         self._messages = {}
-
-        self.token: Optional[str] = None
+        # Fetches that are still running, keyed by what they fetch, see _coalesce
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Future[Any]] = {}
 
         user_agent = 'agnostica/{0} (https://github.com/Reapimus/agnostica) Python{1[0]}.{1[1]} aiohttp/{2}'
         self.user_agent: str = user_agent.format(__version__, sys.version_info, aiohttp.__version__)
+        self.token = None
+
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    @token.setter
+    def token(self, token: Optional[str]) -> None:
+        # The headers only change along with the token, so they are built here
+        # once and handed to every request as is (aiohttp copies them)
+        self._token = token
+        headers = {'User-Agent': self.user_agent}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        self._headers: Dict[str, str] = headers
+        self._json_headers: Dict[str, str] = {**headers, 'Content-Type': 'application/json'}
     
-    async def request(self, route: Route, **kwargs):
+    def _create_session(self) -> aiohttp.ClientSession:
+        # One long-lived session is shared by every request (API calls and CDN
+        # downloads alike) so that connections, and their TLS handshakes, are reused
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_size,
+            enable_cleanup_closed=True,
+        )
+        # There is no total timeout since large uploads and downloads can legitimately take a while
+        timeout = aiohttp.ClientTimeout(total=None, connect=10, sock_read=60)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def request(self, route: Route, *, session: Optional[aiohttp.ClientSession] = None, **kwargs):
+        if session is None:
+            if self.session is None:
+                self.session = self._create_session()
+            session = self.session
+
         url = route.url
         method = route.method
 
-        headers: Dict[str, str] = {
-            'User-Agent': self.user_agent,
-        }
-
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
-        
         if 'json' in kwargs:
-            headers['Content-Type'] = 'application/json'
-            kwargs['data'] = json.dumps(kwargs.pop('json'))
-        
+            headers = self._json_headers
+            kwargs['data'] = _to_json(kwargs.pop('json'))
+        else:
+            headers = self._headers
+
         kwargs['headers'] = headers
 
-        log_url = url
-        if kwargs.get('params'):
-            if isinstance(kwargs['params'], dict):
-                log_url = url + '?' + '&'.join(f'{k}={v}' for k, v in kwargs['params'].items())
-            elif isinstance(kwargs['params'], Iterable):
-                log_url = url + '?' + '&'.join(kwargs['params'])
-        
-        log_headers = headers.copy()
-        if 'Authorization' in log_headers:
-            log_headers['Authorization'] = 'Bearer [removed]'
-        
+        # the log-friendly url and headers are only worth building if they are logged
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            log_url = url
+            if kwargs.get('params'):
+                if isinstance(kwargs['params'], dict):
+                    log_url = url + '?' + urlencode(kwargs['params'], doseq=True)
+                elif isinstance(kwargs['params'], Iterable):
+                    log_url = url + '?' + '&'.join(kwargs['params'])
+
+            log_headers = headers.copy()
+            if 'Authorization' in log_headers:
+                log_headers['Authorization'] = 'Bearer [removed]'
+
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
-        for tries in range(5):
+        last_try = len(_RETRY_DELAYS) - 1
+        for tries, delay in enumerate(_RETRY_DELAYS):
             try:
-                response = await self.session.request(method, url, **kwargs)
+                response = await session.request(method, url, **kwargs)
             except OSError as exc:
-                if tries < 4 and exc.errno in (54, 10054):
-                    await asyncio.sleep(1 + tries * 2)
+                if tries < last_try and exc.errno in (54, 10054):
+                    await asyncio.sleep(delay)
                     continue
                 raise
         
-            log.debug('%s %s with data %s, headers %s has returned %s', method, log_url, kwargs.get('data'), log_headers, response.status)
+            if debug:
+                log.debug('%s %s with data %s, headers %s has returned %s', method, log_url, kwargs.get('data'), log_headers, response.status)
 
             if response.headers.get('Content-Type', '').startswith(('image/', 'video/')):
                 data = await response.read()
             else:
                 data = await json_or_text(response)
-                log.debug('%s %s has received %s', method, log_url, data)
+                if debug:
+                    log.debug('%s %s has received %s', method, log_url, data)
             
             # The request was successful so just return the response
-            if 300 > response.status >= 200:
+            status = response.status
+            if 300 > status >= 200:
                 return data
             
-            if response.status == 429:
+            if status == 429:
                 retry_after = response.headers.get('retry-after')
-                retry_after = float(retry_after) if retry_after is not None else (1 + tries * 2)
+                retry_after = float(retry_after) if retry_after is not None else delay
 
                 log.warning(
                     'Rate limited on %s. Retrying in %s seconds',
@@ -239,18 +285,11 @@ class HTTPClientBase:
                 continue
             
             # We've received a 500, 502, 504, or 524, unconditional retry
-            if response.status in {500, 502, 504, 524}:
-                await asyncio.sleep(1 + tries * 2)
+            if status in _RETRY_STATUSES:
+                await asyncio.sleep(delay)
                 continue
             
-            if response.status == 403:
-                raise Forbidden(response, data)
-            elif response.status == 404:
-                raise NotFound(response, data)
-            elif response.status >= 500:
-                raise PlatformServerError(response, data)
-            else:
-                raise HTTPException(response, data)
+            raise _exception_for_status(status)(response, data)
         
         if response is not None:
             # We've run out of retries
@@ -261,15 +300,51 @@ class HTTPClientBase:
 
         raise RuntimeError('Unreachable code in HTTP handling')
     
+    def _coalesce(self, key: Tuple[Any, ...], coro_factory: Callable[[], Awaitable[T]]) -> Awaitable[T]:
+        # Concurrent callers fetching the same object share a single request
+        # instead of each sending their own. Every caller awaits the shared
+        # future through a shield so that one of them being cancelled does not
+        # cancel it for the others.
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(coro_factory())
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return asyncio.shield(future)
+
     async def close(self) -> None:
         if self.session:
             await self.session.close()
     
     @property
-    def _all_server_channels(self) -> Dict[str, Any]:
-        all_channels = {}
-        for server in self._servers.values():
-            all_channels.update(server._channels)
+    def _all_server_channels(self) -> ChainMap[str, Any]:
+        # a view over every server's channels rather than a merged copy of them
+        return ChainMap(*[server._channels for server in self._servers.values()])
     
-    def read_filelike_data(self, filelike: Union[Attachment, Asset, File]):
-        return self.request(Route('GET', filelike.url, override_base=self.NO_BASE))
\ No newline at end of file
+    def read_filelike_data(self, filelike: Union[Attachment, Asset, File], *, session: Optional[aiohttp.ClientSession] = None):
+        return self.request(Route('GET', filelike.url, override_base=self.NO_BASE), session=session)
+
+    async def head_filelike_data(self, filelike: Union[Attachment, Asset, File], *, session: Optional[aiohttp.ClientSession] = None) -> None:
+        # Asset hosts only get the User-Agent, like in iter_filelike_data
+        if session is None:
+            if self.session is None:
+                self.session = self._create_session()
+            session = self.session
+
+        async with session.head(filelike.url, headers={'User-Agent': self.user_agent}) as response:
+            if not 300 > response.status >= 200:
+                data = await json_or_text(response)
+                raise _exception_for_status(response.status)(response, data)
+
+    async def iter_filelike_data(self, filelike: Union[Attachment, Asset, File], *, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        # Unlike read_filelike_data the body is never held in memory as a whole,
+        # which matters for large banners and attachments
+        if self.session is None:
+            self.session = self._create_session()
+
+        async with self.session.get(filelike.url, headers={'User-Agent': self.user_agent}) as response:
+            if not 300 > response.status >= 200:
+                data = await json_or_text(response)
+                raise _exception_for_status(response.status)(response, data)
+
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
\ No newline at end of file
@@ -4,11 +4,13 @@ from __future__ import annotations
 import asyncio
 import datetime
 import logging
-from typing import TYPE_CHECKING, Any, Dict, Optional, List, Sequence, Union
+import sys
+from typing import TYPE_CHECKING, Any, Coroutine, Dict, Optional, List, Sequence, Set, Tuple, Union
 
 from .embed import Embed
 from .enums import ChannelVisibility, try_enum, MessageType
 from .errors import HTTPException
+from .http import handle_message_parameters
 from .mixins import Hashable, HasContentMixin
 from .utils import MISSING
 from .globals import platform
@@ -24,8 +26,30 @@ if TYPE_CHECKING:
     from .server import Server
     from .user import Member, User
 
+__all__ = (
+    'ChatMessage',
+    'Message',
+)
+
 log = logging.getLogger(__name__)
 
+# Shared by every message with no replies or hidden previews instead of a new empty list each
+_EMPTY: Tuple[()] = ()
+
+# Deletions scheduled by ChatMessage.delete(delay=...) that have not finished yet
+_delayed_deletes: Set[asyncio.Task[None]] = set()
+
+async def _delete_after(coro: Coroutine[Any, Any, Any], delay: float) -> None:
+    await asyncio.sleep(delay)
+    try:
+        await coro
+    except HTTPException:
+        pass
+
+def _intern_id(value: Any) -> Any:
+    # adapters may use non-string IDs, which cannot be interned
+    return sys.intern(value) if value.__class__ is str else value
+
 class ChatMessage(Hashable, HasContentMixin):
     """A message on a platform.
 
@@ -51,16 +75,13 @@ class ChatMessage(Hashable, HasContentMixin):
         The message's ID.
     content: :class:`str`
         The text content of the message.
-    embeds: List[:class:`.Embed`]
-        The list of embeds in the message.
-        This does not include link unfurl embeds.
     attachments: List[:class:`.Attachment`]
         The list of media attachments in the message.
     channel: :class:`~.abc.ServerChannel`
         The channel this message was sent in.
     webhook_id: Optional[:class:`str`]
         The webhook's ID that sent the message, if applicable.
-    replied_to_ids: List[:class:`str`]
+    replied_to_ids: Sequence[:class:`str`]
         A list of message IDs that the message replied to, up to 5.
     private: :class:`bool`
         Whether the message was sent so that only server moderators and users
@@ -70,7 +91,7 @@ class ChatMessage(Hashable, HasContentMixin):
         users mentioned in the message were not sent a notification.
     pinned: :class:`bool`
         Whether the message is pinned in its channel.
-    hidden_preview_urls: List[:class:`str`]
+    hidden_preview_urls: Sequence[:class:`str`]
         URLs in ``content`` that have been prevented from unfurling as a link
         preview when displayed on the platform.
     created_at: :class:`datetime.datetime`
@@ -83,6 +104,7 @@ class ChatMessage(Hashable, HasContentMixin):
 
     __slots__ = (
         '_state',
+        '_platform',
         'channel',
         'channel_id',
         'server_id',
@@ -99,8 +121,15 @@ class ChatMessage(Hashable, HasContentMixin):
         'private',
         'pinned',
         'content',
-        'embeds',
         'hidden_preview_urls',
+        '_author',
+        '_webhook',
+        '_webhook_username',
+        '_webhook_avatar_url',
+        '_mentions',
+        '_embeds',
+        '_raw_embeds',
+        '_share_url',
     )
 
     def __init__(self, *, state, _platform, channel: Messageable, data, **extra: Any):
@@ -112,52 +141,79 @@ class ChatMessage(Hashable, HasContentMixin):
         self.channel = channel
         self._author = extra.get('author')
         self._webhook = extra.get('webhook')
+        self._share_url: Optional[str] = None
+
+        get = data.get
 
-        self.channel_id: str = data.get('channelId')
-        self.server_id: str = data.get('serverId') or data.get('teamId')
-        self.group_id: Optional[str] = data.get('groupId')
+        # The IDs repeat across every cached message of a channel or server, so
+        # they are interned to keep a single copy of each
+        channel_id = get('channelId')
+        server_id = get('serverId') or get('teamId')
+        group_id = get('groupId')
+        self.channel_id: str = _intern_id(channel_id)
+        self.server_id: str = _intern_id(server_id)
+        self.group_id: Optional[str] = _intern_id(group_id)
 
         self.id: str = data['id']
-        self.type: MessageType = try_enum(MessageType, data.get('type'))
+        self.type: MessageType = try_enum(MessageType, get('type'))
 
-        self.replied_to_ids: List[str] = data.get('replyMessageIds') or data.get('repliesToIds') or []
-        self.author_id: str = data.get('createdBy')
-        self.webhook_id: Optional[str] = data.get('createdByWebhookId') or data.get('webhookId')
+        self.replied_to_ids: Sequence[str] = get('replyMessageIds') or get('repliesToIds') or _EMPTY
+        author_id = get('createdBy')
+        webhook_id = get('createdByWebhookId') or get('webhookId')
+        self.author_id: str = _intern_id(author_id)
+        self.webhook_id: Optional[str] = _intern_id(webhook_id)
         self._webhook_username: Optional[str] = None
         self._webhook_avatar_url: Optional[str] = None
-        self.hidden_preview_urls: List[str] = data.get('hiddenLinkPreviewUrls') or []
+        self.hidden_preview_urls: Sequence[str] = get('hiddenLinkPreviewUrls') or _EMPTY
 
-        self.created_at: datetime.datetime = data.get('createdAt')
-        self.updated_at: Optional[datetime.datetime] = data.get('updatedAt') or data.get('editedAt')
-        self.deleted_at: Optional[datetime.datetime] = data.get('deletedAt')
+        self.created_at: datetime.datetime = get('createdAt')
+        self.updated_at: Optional[datetime.datetime] = get('updatedAt') or get('editedAt')
+        self.deleted_at: Optional[datetime.datetime] = get('deletedAt')
 
-        self.silent: bool = data.get('isSilent') or False
-        self.private: bool = data.get('isPrivate') or False
-        self.pinned: bool = data.get('isPinned') or False
+        self.silent: bool = get('isSilent') or False
+        self.private: bool = get('isPrivate') or False
+        self.pinned: bool = get('isPinned') or False
 
-        if isinstance(data.get('content'), dict):
+        content = get('content')
+        if isinstance(content, dict):
             # Webhook execution responses
-            self.content: str = self._get_full_content(data['content'])
-            hidden_embed_urls: Optional[Dict[str, bool]] = data['content'].get('document', {}).get('data', {}).get('hiddenEmbedUrls')
+            self.content: str = self._get_full_content(content)
+            document = content.get('document')
+            document_data = (document.get('data') if document else None) or {}
+            hidden_embed_urls: Optional[Dict[str, bool]] = document_data.get('hiddenEmbedUrls')
             if hidden_embed_urls:
                 self.hidden_preview_urls = [key for [key, value] in hidden_embed_urls.items() if value]
 
-            profile: Optional[Dict[str, str]] = data['content'].get('document', {}).get('data', {}).get('profile')
+            profile: Optional[Dict[str, str]] = document_data.get('profile')
             if profile:
                 self._webhook_username = profile.get('name')
                 self._webhook_avatar_url = profile.get('profilePicture')
 
         else:
-            self.content: str = data.get('content') or ''
-            self._mentions = self._create_mentions(data.get('mentions'))
-            self.embeds: List[Embed] = [
-                Embed.from_dict(embed) for embed in (data.get('embeds') or [])
-            ]
+            self.content: str = content or ''
+            self._mentions = self._create_mentions(get('mentions'))
+            # embeds are only built once they are accessed, see the embeds property
+            self._raw_embeds: Optional[List[Dict[str, Any]]] = get('embeds') or None
             self._extract_attachments(self.content)
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} id={self.id!r} author={self.author!r} channel={self.channel!r}>'
 
+    @property
+    def embeds(self) -> List[Embed]:
+        """List[:class:`.Embed`]: The list of embeds in the message.
+        This does not include link unfurl embeds."""
+        raw_embeds = self._raw_embeds
+        if raw_embeds is not None:
+            self._embeds = [Embed.from_dict(embed) for embed in raw_embeds]
+            self._raw_embeds = None
+        return self._embeds
+
+    @embeds.setter
+    def embeds(self, embeds: List[Embed]) -> None:
+        self._embeds = embeds
+        self._raw_embeds = None
+
     @property
     def server(self) -> Server:
         """Optional[:class:`.Server`]: The server this message was sent in."""
@@ -184,29 +240,35 @@ class ChatMessage(Hashable, HasContentMixin):
         if self._author:
             return self._author
 
-        user = None
-        if self.server:
-            user = self.server.get_member(self.author_id)
-
-        if not user:
-            user = self._state._get_user(self.author_id)
-
-        if self.webhook_id or self._webhook:
+        webhook = self._webhook
+        if self.webhook_id or webhook:
             data = {
                 'id': self.author_id,
                 'type': 'bot',
             }
             # FIll in webhook defaults if available & then profile overrides if available
-            if self._webhook:
-                data['name'] = self._webhook.name
-                data['profilePicture'] = self._webhook.avatar.url if self._webhook.avatar else None
+            if webhook:
+                avatar = webhook.avatar
+                data['name'] = webhook.name
+                data['profilePicture'] = avatar.url if avatar else None
             if self._webhook_username:
                 data['name'] = self._webhook_username
             if self._webhook_avatar_url:
                 data['profilePicture'] = self._webhook_avatar_url
 
             user = self._state.create_user(data=data)
+        else:
+            user = None
+            server = self.server
+            if server:
+                user = server.get_member(self.author_id)
+
+            if not user:
+                user = self._state._get_user(self.author_id)
 
+        # Once resolved the author is kept, a miss is not since the user may be cached later
+        if user:
+            self._author = user
         return user
 
     @property
@@ -217,11 +279,16 @@ class ChatMessage(Hashable, HasContentMixin):
     @property
     def share_url(self) -> str:
         """:class:`str`: The share URL of the message."""
-        if self.channel:
-            if self._platform.get_message_share_url is not None:
-                return self._platform.get_message_share_url(self)
-            return f'{self.channel.share_url}?messageId={self.id}'
-        return None
+        # a message's ID and channel never change, so the URL is only built once
+        share_url = self._share_url
+        if share_url is None and self.channel:
+            get_message_share_url = self._platform.get_message_share_url
+            if get_message_share_url is not None:
+                share_url = get_message_share_url(self)
+            else:
+                share_url = f'{self.channel.share_url}?messageId={self.id}'
+            self._share_url = share_url
+        return share_url
 
     @property
     def jump_url(self) -> str:
@@ -240,8 +307,11 @@ class ChatMessage(Hashable, HasContentMixin):
         This property relies on message cache. If you need a list of IDs,
         consider :attr:`.replied_to_ids` instead.
         """
-        messages = [self._state._get_message(message_id) for message_id in self.replied_to_ids]
-        return [m for m in messages if m is not None]
+        if not self.replied_to_ids:
+            return []
+
+        get_message = self._state._get_message
+        return [m for m in map(get_message, self.replied_to_ids) if m is not None]
 
     async def delete(self, *, delay: Optional[float] = None) -> None:
         """|coro|
@@ -267,15 +337,10 @@ class ChatMessage(Hashable, HasContentMixin):
         coro = self._platform.delete_channel_message(self.server_id, self.channel_id, self.id)
 
         if delay is not None:
-
-            async def delete(delay: float):
-                await asyncio.sleep(delay)
-                try:
-                    await coro
-                except HTTPException:
-                    pass
-
-            asyncio.create_task(delete(delay))
+            task = asyncio.create_task(_delete_after(coro, delay))
+            # the event loop only keeps weak references to tasks
+            _delayed_deletes.add(task)
+            task.add_done_callback(_delayed_deletes.discard)
 
         else:
             await coro
@@ -326,8 +391,6 @@ class ChatMessage(Hashable, HasContentMixin):
             Could not edit the message.
         """
 
-        from .http import handle_message_parameters
-
         params = handle_message_parameters(
             content=content,
             embed=embed,
@@ -377,7 +440,7 @@ class ChatMessage(Hashable, HasContentMixin):
             If this is not specified, the client's reaction will be removed instead.
         """
         emote_id: int = getattr(emote, 'id', emote)
-        await self._platform.remove_channel_message_reaction(self.channel.id, self.id, emote_id, member.id if member else None)
+        await self._platform.remove_channel_message_reaction(self.channel_id, self.id, emote_id, member.id if member else None)
 
     async def remove_self_reaction(self, emote: Emote, /) -> None:
         """|coro|
@@ -405,14 +468,14 @@ class ChatMessage(Hashable, HasContentMixin):
             The emote to remove.
         """
         emote_id: int = getattr(emote, 'id', emote)
-        await self._platform.remove_channel_message_reactions(self.channel.id, self.id, emote_id)
+        await self._platform.remove_channel_message_reactions(self.channel_id, self.id, emote_id)
 
     async def clear_reactions(self) -> None:
         """|coro|
 
         Bulk remove all the reactions from this message.
         """
-        await self._platform.remove_channel_message_reactions(self.channel.id, self.id)
+        await self._platform.remove_channel_message_reactions(self.channel_id, self.id)
 
     async def reply(
         self,
@@ -434,11 +497,13 @@ class ChatMessage(Hashable, HasContentMixin):
         ``reply_to`` parameter already includes this message.
         """
 
-        reply_to = reply_to if reply_to is not MISSING else []
-        if self not in reply_to:
+        # A new tuple is built so that a list passed by the caller is left untouched
+        if reply_to is MISSING:
+            reply_to = (self,)
+        elif self not in reply_to:
             # We don't have a say in where the message appears in the reply
             # list unfortunately; it is always sorted chronologically.
-            reply_to.append(self)
+            reply_to = (*reply_to, self)
 
         return await self.channel.send(
             content=content,
@@ -514,7 +579,7 @@ class ChatMessage(Hashable, HasContentMixin):
         HTTPException
             Failed to pin the message.
         """
-        await self._platform.pin_channel_message(self.channel.id, self.id)
+        await self._platform.pin_channel_message(self.channel_id, self.id)
 
     async def unpin(self) -> None:
         """|coro|
@@ -530,6 +595,7 @@ class ChatMessage(Hashable, HasContentMixin):
         HTTPException
             Failed to unpin the message.
         """
-        await self._platform.unpin_channel_message(self.channel.id, self.id)
+        await self._platform.unpin_channel_message(self.channel_id, self.id)
 
+# Message is the same class object, not a subclass, so isinstance checks against either name agree
 Message = ChatMessage
\ No newline at end of file
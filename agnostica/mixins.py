@@ -1,5 +1,7 @@
 """This file contains code from guilded.py and discord.py, see LICENSE.txt for full license details."""
-from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import functools
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Dict, List, Optional, Tuple, Union
 
 from .file import Attachment
 from .http import HTTPClientBase
@@ -11,8 +13,11 @@ from .utils import valid_video_extensions
 from .embed import Embed
 from .role import Role
 from .server import Server
+from .globals import platform
+
+if TYPE_CHECKING:
+    from .adapters.base import PlatformAdapter
 
-import re
 
 class EqualityComparable:
     __slots__ = ()
@@ -46,8 +51,9 @@ class Mentions:
         Whether ``@here`` was mentioned.
     """
 
-    def __init__(self, *, state: HTTPClientBase, server: Server, data: Optional[dict]):
+    def __init__(self, *, state: HTTPClientBase, _platform: Optional['PlatformAdapter'] = None, server: Server, data: Optional[dict]):
         self._state = state
+        self._platform = _platform or platform
         self._server = server
         self._users = data.get('users') or []
         self._channels = data.get('channels') or []
@@ -127,90 +133,168 @@ class Mentions:
         """
         # Bots cannot fetch any role information so they are not handled here.
 
-        # Just fetch the whole member list instead of fetching >=5 members individually.
+        # The users, roles and channels do not depend on each other, so they are filled concurrently
+        await asyncio.gather(
+            self._fill_users(ignore_cache, ignore_errors),
+            self._fill_roles(ignore_cache, ignore_errors),
+            self._fill_channels(ignore_cache, ignore_errors),
+        )
+
+    async def _fill_users(self, ignore_cache: bool, ignore_errors: bool) -> None:
+        server = self._server
+        bulk = self._platform.supports_bulk_members
+
+        # Just fetch the whole member list instead of fetching >=5 members individually,
+        # unless the platform can fetch just the ones that are needed in bulk.
         uncached_user_count = len(self._users) - len(self.users)
         if (
-            self._server and (
+            server and not bulk and (
                 uncached_user_count >= 5
                 or (len(self._users) >= 5 and ignore_cache)
             )
         ):
             # `fill_members` here would cause potentially unwanted/unexpected
             # cache usage, especially in large servers.
-            members = await self._server.fetch_members()
+            members = await server.fetch_members()
             user_ids = [user['id'] for user in self._users]
             for member in members:
                 if member.id in user_ids:
                     self._state.add_to_member_cache(member)
 
+        elif server:
+            await self._fetch_missing(
+                [
+                    user_data['id']
+                    for user_data in self._users
+                    if ignore_cache
+                    or not (self._state._get_server_member(server.id, user_data['id']) or self._state._get_user(user_data['id']))
+                ],
+                ('member', server.id),
+                server.fetch_member,
+                functools.partial(self._platform.fetch_members_by_ids, server.id) if bulk else None,
+                self._state.add_to_member_cache,
+                ignore_errors,
+            )
+
         else:
-            for user_data in self._users:
-                cached_user = self._state._get_user(user_data['id'])
-                if self._server:
-                    cached_user = self._state._get_server_member(self._server.id, user_data['id']) or cached_user
-
-                if ignore_cache or not cached_user:
-                    if self._server:
-                        try:
-                            user = await self._server.fetch_member(user_data['id'])
-                        except HTTPException:
-                            if not ignore_errors:
-                                raise
-                        else:
-                            self._state.add_to_member_cache(user)
-                    else:
-                        try:
-                            user = await self._state.get_user(user_data['id'])
-                        except HTTPException:
-                            if not ignore_errors:
-                                raise
-                        else:
-                            self._state.add_to_user_cache(user)
-
-        # Just fetch the whole role list instead of fetching >=5 roles individually.
+            await self._fetch_missing(
+                [
+                    user_data['id']
+                    for user_data in self._users
+                    if ignore_cache or not self._state._get_user(user_data['id'])
+                ],
+                ('user', None),
+                self._state.get_user,
+                None,
+                self._state.add_to_user_cache,
+                ignore_errors,
+            )
+
+    async def _fill_roles(self, ignore_cache: bool, ignore_errors: bool) -> None:
+        server = self._server
+        bulk = self._platform.supports_bulk_roles
+
+        # Just fetch the whole role list instead of fetching >=5 roles individually,
+        # unless the platform can fetch just the ones that are needed in bulk.
         uncached_role_count = len(self._roles) - len(self.roles)
         if (
-            self._server and (
+            server and not bulk and (
                 uncached_role_count >= 5
                 or (len(self._roles) >= 5 and ignore_cache)
             )
         ):
             # `fill_roles` here would cause potentially unwanted/unexpected
             # cache usage, especially in large servers.
-            roles = await self._server.fetch_roles()
+            roles = await server.fetch_roles()
             role_ids = [role['id'] for role in self._roles]
             for role in roles:
                 if role.id in role_ids:
                     self._state.add_to_role_cache(role)
 
-        else:
-            for role_data in self._roles:
-                cached_role = self._state._get_server_role(self._server.id, role_data['id'])
-                if self._server and (ignore_cache or not cached_role):
-                    try:
-                        role = await self._server.fetch_role(role_data['id'])
-                    except HTTPException:
-                        if not ignore_errors:
-                            raise
-                    else:
-                        self._state.add_to_role_cache(role)
+        elif server:
+            await self._fetch_missing(
+                [
+                    role_data['id']
+                    for role_data in self._roles
+                    if ignore_cache or not self._state._get_server_role(server.id, role_data['id'])
+                ],
+                ('role', server.id),
+                server.fetch_role,
+                functools.partial(self._platform.fetch_roles_by_ids, server.id) if bulk else None,
+                self._state.add_to_role_cache,
+                ignore_errors,
+            )
 
-        for channel_data in self._channels:
-            if not self._server:
-                # This should never happen
-                break
-
-            cached_channel = self._state._get_server_channel_or_thread(self._server.id, channel_data['id'])
-            if ignore_cache or not cached_channel:
-                try:
-                    channel = await self._server.fetch_channel(channel_data['id'])
-                except HTTPException:
-                    if not ignore_errors:
-                        raise
-                else:
-                    self._state.add_to_server_channel_cache(channel)
+    async def _fill_channels(self, ignore_cache: bool, ignore_errors: bool) -> None:
+        # Channels are never mentioned outside of a server
+        server = self._server
+        if server:
+            await self._fetch_missing(
+                [
+                    channel_data['id']
+                    for channel_data in self._channels
+                    if ignore_cache or not self._state._get_server_channel_or_thread(server.id, channel_data['id'])
+                ],
+                ('channel', server.id),
+                server.fetch_channel,
+                functools.partial(self._platform.fetch_channels_by_ids, server.id) if self._platform.supports_bulk_channels else None,
+                self._state.add_to_server_channel_cache,
+                ignore_errors,
+            )
+
+    async def _fetch_missing(
+        self,
+        ids: List[str],
+        key: Tuple[str, Optional[str]],
+        fetch_one: Callable[[str], Coroutine[Any, Any, Any]],
+        fetch_many: Optional[Callable[[List[str]], Coroutine[Any, Any, List[Any]]]],
+        add_to_cache: Callable[[Any], Any],
+        ignore_errors: bool,
+    ) -> None:
+        # The fetches are independent of each other, so they run concurrently
+        # rather than one round trip after another. If the platform can fetch
+        # in bulk then each request covers up to BULK_FETCH_LIMIT of the IDs.
+        if not ids:
+            return
+
+        if fetch_many is not None:
+            limit = self._platform.BULK_FETCH_LIMIT
+            coros = [fetch_many(ids[i:i + limit]) for i in range(0, len(ids), limit)]
+        else:
+            # single fetches that are already running for another caller are joined
+            coalesce = self._state._coalesce
+            coros = [coalesce((*key, object_id), functools.partial(fetch_one, object_id)) for object_id in ids]
+
+        error = None
+        for result in await asyncio.gather(*coros, return_exceptions=True):
+            if isinstance(result, BaseException):
+                if error is None and not (ignore_errors and isinstance(result, HTTPException)):
+                    error = result
+            elif fetch_many is not None:
+                for obj in result:
+                    add_to_cache(obj)
+            else:
+                add_to_cache(result)
+
+        # whatever was fetched successfully is still cached before an error is raised
+        if error is not None:
+            raise error
 
 class HasContentMixin:
+    __slots__ = (
+        'emotes',
+        '_raw_user_mentions',
+        '_raw_channel_mentions',
+        '_raw_role_mentions',
+        '_user_mentions',
+        '_channel_mentions',
+        '_role_mentions',
+        '_mentions_everyone',
+        '_mentions_here',
+        'embeds',
+        'attachments',
+    )
+
     def __init__(self):
         self.emotes: list = []
         self._raw_user_mentions: list = []
@@ -333,10 +417,8 @@ class HasContentMixin:
 
         self.attachments.clear()
 
-        if self._platform.ATTACHMENT_REGEX != '':
-            matches: List[Tuple[str, str, str]] = re.findall(self._platform.ATTACHMENT_REGEX, content)
-            for match in matches:
-                caption, url, extension = match
+        if content:
+            for caption, url, extension in self._platform.find_attachments(content):
                 attachment = Attachment(
                     state=self._state,
                     data={
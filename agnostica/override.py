@@ -16,6 +16,7 @@ if TYPE_CHECKING:
         ChannelUserPermission as ChannelUserPermissionPayload,
     )
 
+    from .category import Category
     from .server import Server
 
 __all__ = (
@@ -130,12 +131,17 @@ class _CategoryPermissionOverride:
         *,
         data: Union[ChannelCategoryRolePermissionPayload, ChannelCategoryUserPermissionPayload],
         server: Optional[Server] = None,
+        category: Optional[Category] = None,
     ):
         self.override = PermissionOverride(**{ REVERSE_VALID_NAME_MAP[key]: value for key, value in data['permissions'].items() })
         self.created_at: datetime.datetime = data['createdAt']
         self.updated_at: Optional[datetime.datetime] = data.get('updatedAt')
         self.category_id = data['categoryId']
-        self.category = server.get_category(self.category_id) if server else None
+        # Overrides are usually created by the category they belong to, which
+        # saves looking the same category up again for every override
+        if category is None and server:
+            category = server.get_category(self.category_id)
+        self.category = category
 
 class CategoryRoleOverride(_CategoryPermissionOverride):
     """Represents a role-based permission override in a category.
@@ -163,8 +169,8 @@ class CategoryRoleOverride(_CategoryPermissionOverride):
         'role',
     )
 
-    def __init__(self, *, data: ChannelRolePermissionPayload, server: Optional[Server] = None):
-        super().__init__(data=data, server=server)
+    def __init__(self, *, data: ChannelRolePermissionPayload, server: Optional[Server] = None, category: Optional[Category] = None):
+        super().__init__(data=data, server=server, category=category)
         self.role_id = data['roleId']
         self.role = server.get_role(self.role_id) if server else None
 
@@ -197,8 +203,8 @@ class CategoryUserOverride(_CategoryPermissionOverride):
         'user',
     )
 
-    def __init__(self, *, data: ChannelUserPermissionPayload, server: Optional[Server] = None):
-        super().__init__(data=data, server=server)
+    def __init__(self, *, data: ChannelUserPermissionPayload, server: Optional[Server] = None, category: Optional[Category] = None):
+        super().__init__(data=data, server=server, category=category)
         self.user_id = data['userId']
         self.user = server.get_member(self.user_id) if server else None
 
@@ -88,6 +88,8 @@ class User(agnostica.abc.User, agnostica.abc.Messageable):
         except KeyError:
             pass
 
+        self._clear_cache()
+
 def flatten_user(cls: T) -> T:
     for attr, value in itertools.chain(agnostica.abc.User.__dict__.items(), User.__dict__.items()):
         # ignore private/special methods
@@ -214,6 +216,16 @@ class Member(User):
         """This is an alias of :attr:`.server`. """
         return self.server
 
+    # flatten_user skips private names, and the slots these read on a user
+    # are never filled on a member, so they are forwarded by hand
+    @property
+    def _channel(self) -> Optional[agnostica.abc.Messageable]:
+        return self._user._channel
+
+    @property
+    def _channel_id(self) -> Optional[str]:
+        return self._user._channel_id
+
     @property
     def roles(self) -> List[Role]:
         """List[:class:`.Role`]: The cached list of roles that this member has."""
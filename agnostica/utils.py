@@ -1,6 +1,7 @@
 """This file contains code from guilded.py and discord.py, see LICENSE.txt for full license details."""
 from typing import Any, AsyncIterable, Callable, Coroutine, Iterable, TypeVar, Union
 from operator import attrgetter
+import json
 
 from .mixins import Hashable
 from .globals import platform
@@ -8,6 +9,13 @@ from .globals import platform
 valid_image_extensions = ['png', 'webp', 'jpg', 'jpeg', 'gif', 'jif', 'tif', 'tiff', 'apng', 'bmp', 'svg']
 valid_video_extensions = ['mp4', 'mpeg', 'mpg', 'mov', 'avi', 'wmv', 'qt', 'webm']
 
+try:
+    import orjson  # type: ignore
+except ModuleNotFoundError:
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
 T = TypeVar('T')
 T_co = TypeVar('T_co', covariant=True)
 _Iter = Union[Iterable[T], AsyncIterable[T]]
@@ -25,6 +33,20 @@ class _MissingSentinel:
 
 MISSING: Any = _MissingSentinel()
 
+if HAS_ORJSON:
+
+    def _to_json(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+
+    _from_json = orjson.loads  # type: ignore
+
+else:
+
+    def _to_json(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=True)
+
+    _from_json = json.loads
+
 def get(sequence, **attributes):
     """Return an object from ``sequence`` that matches the ``attributes``.
 
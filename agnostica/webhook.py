@@ -3,7 +3,6 @@ from __future__ import annotations
 
 import logging
 import asyncio
-import json
 import re
 
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
@@ -17,7 +16,7 @@ from .errors import HTTPException, Forbidden, NotFound, PlatformServerError
 from .message import ChatMessage
 from .user import Member, User
 from .asset import Asset
-from .http import Route, handle_message_parameters
+from .http import _RETRY_DELAYS, Route, handle_message_parameters
 from .file import File
 from .globals import platform
 from .adapters.base import PlatformAdapter
@@ -64,14 +63,15 @@ class AsyncWebhookAdapter:
 
         if payload is not None:
             headers['Content-Type'] = 'application/json'
-            to_send = json.dumps(payload)
+            to_send = utils._to_json(payload)
 
         response: Optional[aiohttp.ClientResponse] = None
         data: Optional[Union[Dict[str, Any], str]] = None
         method = route.method
         url = route.url
 
-        for attempt in range(5):
+        last_attempt = len(_RETRY_DELAYS) - 1
+        for attempt, delay in enumerate(_RETRY_DELAYS):
             for file in files:
                 file.reset(seek=attempt)
 
@@ -92,7 +92,7 @@ class AsyncWebhookAdapter:
                     )
                     data = (await response.text(encoding='utf-8')) or None
                     if data and response.headers['Content-Type'] == 'application/json':
-                        data = json.loads(data)
+                        data = utils._from_json(data)
 
                     if 300 > response.status >= 200:
                         return data
@@ -112,7 +112,7 @@ class AsyncWebhookAdapter:
                         continue
 
                     if response.status >= 500:
-                        await asyncio.sleep(1 + attempt * 2)
+                        await asyncio.sleep(delay)
                         continue
 
                     if response.status == 403:
@@ -123,8 +123,8 @@ class AsyncWebhookAdapter:
                         raise HTTPException(response, data)
 
             except OSError as e:
-                if attempt < 4 and e.errno in (54, 10054):
-                    await asyncio.sleep(1 + attempt * 2)
+                if attempt < last_attempt and e.errno in (54, 10054):
+                    await asyncio.sleep(delay)
                     continue
                 raise
 
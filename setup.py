@@ -35,4 +35,7 @@ setuptools.setup(
     license='MIT',
     python_requires='>=3.11',
     install_requires=['aiohttp'],
+    extras_require={
+        'speed': ['orjson>=3.5.4'],
+    },
 )
\ No newline at end of file